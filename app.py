@@ -1,38 +1,111 @@
-from flask import Flask, send_from_directory
-from flask_pymongo import PyMongo
+import os
+from flask import Flask
 from config import Config
-from flask_cors import CORS 
-from routes.user_routes import create_auth_routes
-from routes.login_routes import setup_login_routes
-from routes.earphone_routes import create_earphones_routes
-from routes.headphone_route import create_headphone_routes
-from routes.smartwatch_routes import create_smartwatch_routes
-from routes.earphones_details_routes import create_earphone_details_routes
-from routes.headphone_details_routes import create_headphone_details_routes
-from routes.smartwatch_details_routes import create_smartwatch_details_routes
-from routes.adminlogin_routes import setup_admin_routes
-
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
-# Load MongoDB configuration
-app.config.from_object(Config)
-mongo = PyMongo(app)
-
-app.config['UPLOAD_FOLDER'] = 'uploads'
-@app.route('/uploads/<filename>')
-def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
-
-auth_bp = create_auth_routes(mongo.db)
-app.register_blueprint(auth_bp, url_prefix="/auth")
-app.register_blueprint(setup_login_routes(mongo.db))
-app.register_blueprint(create_earphones_routes(mongo.db))
-app.register_blueprint(create_headphone_routes(mongo.db))
-app.register_blueprint(create_smartwatch_routes(mongo.db))
-app.register_blueprint(create_earphone_details_routes(mongo.db, upload_folder="uploads"))
-app.register_blueprint(create_headphone_details_routes(mongo.db, upload_folder="uploads"))
-app.register_blueprint(create_smartwatch_details_routes(mongo.db, upload_folder="uploads"))
-app.register_blueprint(setup_admin_routes(mongo.db))
+from categories import CATEGORIES
+
+
+def blueprints(db, upload_root):
+    """Yield (blueprint, url_prefix) for every route module.
+
+    Route modules, models and their dependencies are imported here, when an
+    app is created, not when this module is imported, so tools that only need
+    the factory (gunicorn's master, the CLI, tests) pay for what they use.
+    """
+    from routes.user_routes import create_auth_routes
+    from routes.login_routes import setup_login_routes
+    from routes.adminlogin_routes import setup_admin_routes
+    from routes.category_routes import create_category_routes
+    from routes.category_details_routes import create_category_details_routes
+    from routes.cache_routes import create_cache_routes
+    from routes.search_routes import create_search_routes
+    from routes.catalog_routes import create_catalog_routes
+    from routes.health_routes import create_health_routes
+    from routes.metrics_routes import create_metrics_routes
+
+    yield create_auth_routes(db), "/auth"
+    yield setup_login_routes(db), None
+    # Catalog and detail blueprints for every registered category
+    for category in CATEGORIES.values():
+        yield create_category_routes(db, category, upload_root), None
+        yield create_category_details_routes(db, category, upload_root), None
+    yield setup_admin_routes(db), None
+    yield create_cache_routes(), None
+    yield create_search_routes(db), None
+    yield create_catalog_routes(db), None
+    yield create_health_routes(db), None
+    yield create_metrics_routes(), None
+
+
+def ensure_indexes(config):
+    """Create and verify indexes over a short-lived client.
+
+    The app's own client must stay unconnected until after gunicorn forks its
+    workers (preload_app), so startup checks never go through it.
+    """
+    from pymongo import MongoClient
+    from models.index_manager import IndexManager
+
+    with MongoClient(config["MONGO_URI"], serverSelectionTimeoutMS=config["MONGO_SERVER_SELECTION_TIMEOUT_MS"]) as client:
+        index_manager = IndexManager(client.get_default_database())
+        index_manager.ensure_indexes()
+        index_manager.verify_query_plans()
+
+
+def create_app(config=Config):
+    from flask_cors import CORS
+    from flask_pymongo import PyMongo
+    from utils.cache import configure_caches
+    from utils.passwords import configure_hasher
+    from utils.thumbnails import configure_thumbnails
+    from utils.media import configure_media, get_media
+    from utils.image_urls import configure_image_urls
+    from utils.mongo_pool import client_options, configure_read_routing
+    from utils.logs import configure_logging
+    from utils.metrics import instrument_app
+    from utils.json_provider import configure_json
+    from models.search_index import configure_search
+    from models.price_index import configure_price_indexes
+    from cli import register_cli
+
+    app = Flask(__name__)
+    configure_json(app)
+    # Browsers only let scripts read the pagination and validator headers when exposed
+    CORS(app, resources={r"/*": {"origins": "*"}}, expose_headers=["X-Next-Cursor", "Link", "ETag"])
+    # Load MongoDB configuration
+    app.config.from_object(config)
+    configure_logging(app.config)
+    if app.config["METRICS_ENABLED"]:
+        instrument_app(app, app.config["LOG_SLOW_REQUEST_MS"])
+    # connect=False: sockets and monitor threads start on first use, i.e. in each worker after fork
+    mongo = PyMongo(app, connect=False, **client_options(app.config))
+    app.extensions["mongo"] = mongo
+    configure_caches(app.config)
+    # Services live on app.extensions["soundbox"], so apps in one process stay independent
+    configure_hasher(app)
+    configure_read_routing(app)
+    configure_search(app, mongo.db)
+    configure_price_indexes(app, mongo.db)
+
+    # Fail fast if the indexes the hot paths depend on are missing
+    if app.config["ENSURE_INDEXES_ON_STARTUP"]:
+        ensure_indexes(app.config)
+
+    # Relative to the app root unless the config sets an absolute path
+    app.config.setdefault('UPLOAD_FOLDER', 'uploads')
+    upload_root = os.path.join(app.root_path, app.config['UPLOAD_FOLDER'])
+    configure_media(app, upload_root)
+    configure_image_urls(app)
+    configure_thumbnails(app, upload_root)
+    @app.route('/uploads/<filename>')
+    def uploaded_file(filename):
+        return get_media().send(upload_root, filename)
+
+    for blueprint, url_prefix in blueprints(mongo.db, upload_root):
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+    register_cli(app, mongo.db, upload_root)
+    return app
+
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    # Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`
+    create_app().run(debug=os.environ.get("FLASK_DEBUG") == "1", host="0.0.0.0", port=5000)
@@ -0,0 +1,4 @@
+# Async read path: hypercorn -w 4 -b 0.0.0.0:5001 asgi:app
+from async_app import create_async_app
+
+app = create_async_app()
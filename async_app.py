@@ -0,0 +1,53 @@
+import os
+from config import Config
+from categories import CATEGORIES
+
+
+def create_async_app(config=Config):
+    """Read-only ASGI app serving the catalog and detail GETs over the async MongoDB driver.
+
+    It runs beside the WSGI app (`hypercorn asgi:app`) behind the same proxy;
+    writes, auth, search, price ranges and uploads stay on the WSGI app.
+    """
+    try:
+        from quart import Quart
+    except ImportError:
+        raise RuntimeError("The async app needs Quart: pip install quart")
+    from utils.cache import configure_caches
+    from utils.image_urls import configure_image_urls
+    from utils.thumbnails import configure_thumbnails
+    from utils.mongo_pool import configure_read_routing
+    from utils.logs import configure_logging
+    from models.async_reads import async_client
+    from routes.async_catalog_routes import create_async_category_routes
+
+    app = Quart(__name__)
+    app.config.from_object(config)
+    configure_logging(app.config)
+    # The async client opens its connections lazily, on the serving event loop
+    client = async_client(app.config)
+    app.extensions["mongo"] = client
+    db = client.get_default_database()
+    configure_caches(app.config)
+    configure_read_routing(app)
+    configure_image_urls(app)
+    # Only used for srcset links; variants are generated by the WSGI app on upload
+    configure_thumbnails(app, os.path.join(app.root_path, "uploads"))
+
+    # Same origin policy as the WSGI app's CORS(origins="*"); every route is a simple GET
+    @app.after_request
+    async def allow_any_origin(response):
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        response.headers["Access-Control-Expose-Headers"] = "X-Next-Cursor, Link, ETag"
+        return response
+
+    @app.after_serving
+    async def close_client():
+        closed = client.close()
+        # Motor's close() is synchronous, PyMongo's async client returns a coroutine
+        if closed is not None:
+            await closed
+
+    for category in CATEGORIES.values():
+        app.register_blueprint(create_async_category_routes(db, category))
+    return app
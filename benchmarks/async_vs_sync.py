@@ -0,0 +1,118 @@
+"""Product page reads under concurrent load: sync models on threads vs the async driver.
+
+Each request is the product page workload (item, its details, related
+items). The sync side runs it sequentially per request on a thread pool,
+as a gthread worker would; the async side fetches the item and details
+concurrently with asyncio.gather. Read caches are disabled so every request
+reaches MongoDB, which must hold some data (e.g. mongoimport of exports/).
+
+    python benchmarks/async_vs_sync.py --requests 2000 --concurrency 1,8,32,64 [--out async.json]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import metadata, summarize, write_results
+
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from config import Config
+from categories import CATEGORIES
+from utils.cache import configure_caches
+from utils.mongo_pool import client_options
+
+
+def config_dict():
+    return {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+
+
+def run_sync(db, category, ids, concurrency):
+    from models.category_model import CategoryModel
+    from models.category_details_model import CategoryDetailsModel
+
+    model = CategoryModel(db, category)
+    details_model = CategoryDetailsModel(db, category)
+
+    def product_page(item_id):
+        started = time.perf_counter()
+        item = model.get_item_by_id(item_id)
+        details_model.get_details_for_parent(item_id)
+        model.get_related(item)
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        latencies = list(pool.map(product_page, ids))
+        return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_async(config, category, ids, concurrency):
+    from models.async_reads import AsyncCategoryReads, async_client
+
+    client = async_client(config)
+    reads = AsyncCategoryReads(client.get_default_database(), category)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def product_page(item_id):
+        async with limit:
+            started = time.perf_counter()
+            item, _ = await asyncio.gather(reads.get_item_by_id(item_id), reads.get_details_for_parent(item_id))
+            await reads.get_related(item)
+            return time.perf_counter() - started
+
+    try:
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(product_page(item_id) for item_id in ids))
+        return summarize(latencies, time.perf_counter() - started)
+    finally:
+        closed = client.close()
+        if closed is not None:
+            await closed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--category", default=next(iter(CATEGORIES)), choices=list(CATEGORIES))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="1,8,32,64",
+                        help="Comma separated concurrency levels.")
+    parser.add_argument("--out", help="Write the JSON results to this file as well.")
+    args = parser.parse_args()
+
+    config = config_dict()
+    category = CATEGORIES[args.category]
+    # Every request goes to MongoDB; the comparison is about the driver, not the cache
+    configure_caches({**config, "CACHE_DISABLED_COLLECTIONS": [category.collection, category.detail_collection]})
+
+    client = MongoClient(config["MONGO_URI"], serverSelectionTimeoutMS=2000)
+    db = client.get_default_database()
+    try:
+        item_ids = [str(doc["_id"]) for doc in db[category.collection].find({}, {"_id": 1})]
+    except PyMongoError as e:
+        sys.exit(f"MongoDB is not reachable at {config['MONGO_URI']}: {e}")
+    if not item_ids:
+        sys.exit(f"No documents in {category.collection}; import exports/ first")
+    ids = [random.choice(item_ids) for _ in range(args.requests)]
+
+    # The sync models use a client sized like the app's, with the same pool settings
+    sync_client = MongoClient(config["MONGO_URI"], **client_options(config))
+    results = {"meta": metadata(category=category.name, requests=args.requests), "levels": []}
+    try:
+        for concurrency in [int(level) for level in args.concurrency.split(",")]:
+            results["levels"].append({
+                "concurrency": concurrency,
+                "sync": run_sync(sync_client.get_default_database(), category, ids, concurrency),
+                "async": asyncio.run(run_async(config, category, ids, concurrency)),
+            })
+    finally:
+        sync_client.close()
+        client.close()
+
+    write_results(results, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Helpers shared by the benchmark scripts: latency summaries, RSS, result files and baselines."""
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Compared against a baseline; throughput is better when higher, latencies when lower
+COMPARED = {"throughput_rps": 1, "p50_ms": -1, "p95_ms": -1, "p99_ms": -1}
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Throughput and latency percentiles for one run; latencies in seconds."""
+    latencies = sorted(latencies)
+    if len(latencies) < 2:
+        quantiles = latencies * 99 or [0.0] * 99
+    else:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+def rss_mb(pid="self"):
+    """Current resident set size of a process in MiB, from /proc; None where unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB (ru_maxrss is kB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(**extra):
+    return {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        **extra,
+    }
+
+
+def write_results(results, path):
+    print(json.dumps(results, indent=2))
+    if path:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def compare(results, baseline_path):
+    """Print each scenario's change against a baseline result file, in percent.
+
+    A positive change is an improvement for every column, so regressions
+    stand out as negative numbers whatever the metric.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs. baseline {baseline_path} (revision {baseline.get('meta', {}).get('revision')}), "
+          "+ is better:")
+    print(f"{'scenario':<12}" + "".join(f"{name:>16}" for name in COMPARED))
+    for scenario, current in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if not before:
+            continue
+        cells = []
+        for name, direction in COMPARED.items():
+            old, new = before.get(name), current.get(name)
+            if not old or new is None:
+                cells.append(f"{'n/a':>16}")
+                continue
+            change = (new - old) / old * 100 * direction
+            cells.append(f"{change:>+15.1f}%")
+        print(f"{scenario:<12}" + "".join(cells))
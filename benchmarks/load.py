@@ -0,0 +1,343 @@
+"""Load test of the SoundBox API: list, item, detail, login and upload endpoints at fixed concurrency.
+
+The database is seeded from exports/*.json, scaled up to --products synthetic
+products (with one detail each) per category, plus a benchmark user. By
+default the app runs in-process over mongomock; --mongo-uri seeds and uses a
+real MongoDB database instead (dropped before and after the run), and --url
+drives an already running server seeded with --seed-only.
+
+    python benchmarks/load.py --products 5000 --concurrency 16 --out after.json --baseline before.json
+    python benchmarks/load.py --mongo-uri mongodb://127.0.0.1:27017 --products 50000
+    python benchmarks/load.py --mongo-uri mongodb://127.0.0.1:27017 --database soundbox_bench --seed-only
+    python benchmarks/load.py --url http://127.0.0.1:5000 --server-pid 1234 --admin-token ...
+"""
+import argparse
+import glob
+import http.client
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from harness import ROOT, compare, metadata, peak_rss_mb, rss_mb, summarize, write_results
+
+from bson import ObjectId
+from werkzeug.security import generate_password_hash
+from config import Config
+from categories import CATEGORIES
+from models.price_index import price_to_minor
+from utils.image_urls import image_key
+from utils.snapshots import collection_from_filename, iter_snapshot
+
+SCENARIOS = ("list", "item", "detail", "login", "upload")
+# Login hashes a password and upload writes a file; they get their own, smaller request count
+SLOW_SCENARIOS = {"login", "upload"}
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "bench-password"
+UPLOAD_IMAGE = os.path.join(ROOT, "uploads", "earphones", "Earphone6.jpg")
+BATCH_SIZE = 1000
+
+
+def load_exports(pattern):
+    """{collection: [documents]} from the export files."""
+    exports = {}
+    for path in sorted(glob.glob(pattern)):
+        exports[collection_from_filename(path)] = list(iter_snapshot(path))
+    return exports
+
+
+def seed(db, exports, products, rng):
+    """Fill db with `products` items per category cloned from the exports; returns {category: [ids]}."""
+    ids = {}
+    for category in CATEGORIES.values():
+        templates = exports.get(category.collection) or []
+        details_by_parent = {}
+        for detail in exports.get(category.detail_collection) or []:
+            details_by_parent.setdefault(str(detail[category.foreign_key]), detail)
+        if not templates:
+            continue
+
+        ids[category.name] = []
+        items, details = [], []
+        for i in range(products):
+            template = templates[i % len(templates)]
+            item_id = ObjectId()
+            # Spread prices so range queries and price sorts see realistic distributions
+            price = round(template["price"] * rng.uniform(0.5, 1.5))
+            item = {
+                "_id": item_id,
+                "name": f"{template['name']} #{i}",
+                "price": price,
+                "price_minor": price_to_minor(price),
+                "image_url": image_key(template["image_url"]),
+            }
+            items.append(item)
+            detail = details_by_parent.get(str(template["_id"]))
+            if detail:
+                details.append({
+                    "name": item["name"], "price": price, "image_url": item["image_url"],
+                    "description": detail.get("description", ""),
+                    category.foreign_key: str(item_id),
+                })
+            ids[category.name].append(str(item_id))
+            if len(items) >= BATCH_SIZE:
+                db[category.collection].insert_many(items)
+                items = []
+        if items:
+            db[category.collection].insert_many(items)
+        for start in range(0, len(details), BATCH_SIZE):
+            db[category.detail_collection].insert_many(details[start:start + BATCH_SIZE])
+
+    db.signup.insert_one({
+        "name": "Bench", "email": BENCH_EMAIL,
+        "password": generate_password_hash(BENCH_PASSWORD, Config.PASSWORD_HASH_METHOD, Config.PASSWORD_SALT_LENGTH),
+    })
+    return ids
+
+
+def multipart(fields, files):
+    """Encode a multipart/form-data body; returns (content_type, bytes)."""
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    for name, value in fields.items():
+        body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content, content_type) in files.items():
+        body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+                   f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'.encode())
+        body.write(content + b"\r\n")
+    body.write(f"--{boundary}--\r\n".encode())
+    return f"multipart/form-data; boundary={boundary}", body.getvalue()
+
+
+class Workload:
+    """Builds the (method, path, headers, body) of one request of each scenario."""
+
+    def __init__(self, ids, rng, admin_token=None):
+        self.ids = {name: item_ids for name, item_ids in ids.items() if item_ids}
+        self.categories = list(self.ids)
+        self.rng = rng
+        self.admin_token = admin_token
+        with open(UPLOAD_IMAGE, "rb") as f:
+            self.image = f.read()
+
+    def _pick(self):
+        category = self.rng.choice(self.categories)
+        return category, self.rng.choice(self.ids[category])
+
+    def request(self, scenario):
+        if scenario == "list":
+            category = self.rng.choice(self.categories)
+            sort = self.rng.choice(("_id", "price", "-price"))
+            return "GET", f"/{category}?limit=20&sort={sort}", {}, None
+        if scenario == "item":
+            category, item_id = self._pick()
+            return "GET", f"/{category}/{item_id}", {}, None
+        if scenario == "detail":
+            category, item_id = self._pick()
+            return "GET", f"/{category}/{item_id}/details", {}, None
+        if scenario == "login":
+            body = json.dumps({"email": BENCH_EMAIL, "password": BENCH_PASSWORD}).encode()
+            return "POST", "/login", {"Content-Type": "application/json"}, body
+        if scenario == "upload":
+            category = self.rng.choice(self.categories)
+            content_type, body = multipart(
+                {"name": f"Bench upload {uuid.uuid4().hex[:8]}", "price": str(self.rng.randint(500, 20000))},
+                {"image": ("bench.jpg", self.image, "image/jpeg")},
+            )
+            headers = {"Content-Type": content_type}
+            if self.admin_token:
+                headers["Authorization"] = f"Bearer {self.admin_token}"
+            return "POST", f"/{category}", headers, body
+        raise ValueError(scenario)
+
+
+class InProcessClient:
+    """Sends requests through the Flask test client, one per thread."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method, path, headers, body):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, headers=headers, data=body)
+        response.close()
+        return response.status_code
+
+
+class HTTPClient:
+    """Sends requests to a running server over keep-alive connections, one per thread."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self._local = threading.local()
+
+    def send(self, method, path, headers, body):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self.connection_class(self.netloc, timeout=30)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+
+
+def run_scenario(client, workload, scenario, requests, concurrency, warmup):
+    """Send `requests` requests of one scenario from `concurrency` threads; returns the summary."""
+    prepared = [workload.request(scenario) for _ in range(requests + warmup)]
+
+    def send(request):
+        started = time.perf_counter()
+        try:
+            status = client.send(*request)
+        except Exception:
+            status = None
+        return time.perf_counter() - started, status is not None and status < 400
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, prepared[:warmup]))
+        started = time.perf_counter()
+        outcomes = list(pool.map(send, prepared[warmup:]))
+        elapsed = time.perf_counter() - started
+    errors = sum(1 for _, ok in outcomes if not ok)
+    return summarize([latency for latency, _ in outcomes], elapsed, errors)
+
+
+def collect_ids(client):
+    """Item ids of a running server, read through its list endpoints."""
+    ids = {}
+    for category in CATEGORIES.values():
+        connection = client.connection_class(client.netloc, timeout=30)
+        connection.request("GET", f"/{category.name}?limit=100")
+        response = connection.getresponse()
+        items = json.loads(response.read()) if response.status == 200 else []
+        connection.close()
+        ids[category.name] = [item["_id"] for item in items]
+    return ids
+
+
+def in_process_app(db, upload_root):
+    """create_app() over the seeded database, with uploads going to a temporary folder."""
+    import flask_pymongo
+    from app import create_app
+
+    class SeededPyMongo:
+        def __init__(self, app=None, *args, **kwargs):
+            self.db = db
+            self.cx = db.client
+
+    class BenchConfig(Config):
+        UPLOAD_FOLDER = upload_root
+        ENSURE_INDEXES_ON_STARTUP = False
+        # Measures the upload path itself; --url runs need --admin-token instead
+        ADMIN_WRITE_AUTH = False
+        LOG_SAMPLE_RATE = 0.0
+
+    # The benchmark owns the client (mongomock or the bench database), not the config URI
+    flask_pymongo.PyMongo = SeededPyMongo
+    return create_app(BenchConfig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=1000, help="Synthetic products per category.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per read scenario.")
+    parser.add_argument("--slow-requests", type=int, default=100, help="Requests for login and upload.")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for data and request mix.")
+    parser.add_argument("--exports", default=os.path.join(ROOT, "exports", "*.json"))
+    parser.add_argument("--mongo-uri", help="Use this MongoDB instead of mongomock.")
+    parser.add_argument("--database", default="soundbox_bench")
+    parser.add_argument("--seed-only", action="store_true", help="Seed --mongo-uri/--database and exit.")
+    parser.add_argument("--url", help="Drive a running server instead of an in-process app.")
+    parser.add_argument("--server-pid", type=int, help="Report the RSS of this process (--url runs).")
+    parser.add_argument("--admin-token", help="Bearer token for uploads (--url runs).")
+    parser.add_argument("--out", help="Write the JSON results to this file as well.")
+    parser.add_argument("--baseline", help="Compare against an earlier --out file.")
+    args = parser.parse_args()
+
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    rng = random.Random(args.seed)
+
+    client = db = upload_root = None
+    if args.url:
+        client = HTTPClient(args.url)
+        ids = collect_ids(client)
+        backend = args.url
+    else:
+        if args.mongo_uri:
+            from pymongo import MongoClient
+            db = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)[args.database]
+            db.client.drop_database(args.database)
+            backend = f"mongodb ({args.database})"
+        else:
+            try:
+                import mongomock
+            except ImportError:
+                parser.error("mongomock is not installed; pip install mongomock or pass --mongo-uri")
+            db = mongomock.MongoClient()[args.database]
+            backend = "mongomock"
+
+        from models.index_manager import IndexManager
+        started = time.perf_counter()
+        ids = seed(db, load_exports(args.exports), args.products, rng)
+        IndexManager(db).ensure_indexes()
+        print(f"Seeded {sum(len(v) for v in ids.values())} products in {time.perf_counter() - started:.1f}s",
+              flush=True)
+        if args.seed_only:
+            return
+        upload_root = tempfile.mkdtemp(prefix="soundbox-bench-")
+        client = InProcessClient(in_process_app(db, upload_root))
+
+    rss_pid = args.server_pid or ("self" if not args.url else None)
+    workload = Workload(ids, rng, args.admin_token)
+    results = {
+        "meta": metadata(backend=backend, products_per_category=args.products,
+                         concurrency=args.concurrency, seed=args.seed),
+        "scenarios": {},
+        "rss_mb": {"start": rss_mb(rss_pid) if rss_pid else None},
+    }
+    try:
+        for scenario in scenarios:
+            requests = args.slow_requests if scenario in SLOW_SCENARIOS else args.requests
+            results["scenarios"][scenario] = run_scenario(
+                client, workload, scenario, requests, args.concurrency, min(args.warmup, requests))
+            if rss_pid:
+                results["rss_mb"][f"after_{scenario}"] = rss_mb(rss_pid)
+            print(f"{scenario}: {results['scenarios'][scenario]}", flush=True)
+    finally:
+        if upload_root:
+            shutil.rmtree(upload_root, ignore_errors=True)
+        if args.mongo_uri and not args.url:
+            db.client.drop_database(args.database)
+    if not args.url:
+        results["rss_mb"]["peak"] = peak_rss_mb()
+
+    write_results(results, args.out)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
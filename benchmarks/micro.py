@@ -0,0 +1,115 @@
+"""Micro-benchmarks of the per-request helpers on the hot read paths.
+
+Each case is timed with timeit in-process, without MongoDB, and reported as
+the best mean time per call over --repeat rounds.
+
+    python benchmarks/micro.py [--items 10000] [--repeat 5] [--out micro.json] [--baseline before.json]
+"""
+import argparse
+import json
+import logging
+import random
+import timeit
+
+from harness import metadata, write_results
+
+from bson import ObjectId
+from utils.cache import TTLCache
+from utils.image_urls import present_all
+from utils.logs import JsonFormatter
+from utils.json_provider import encode
+from utils.metrics import Registry
+from utils.pagination import decode_cursor, encode_cursor, serialize_page
+from utils.versioning import compute_etag
+from models.price_index import PriceIndex, RangeRequest
+
+
+class StaticVersions:
+    """Stands in for CollectionVersions so PriceIndex.query never rebuilds."""
+
+    def get(self, name):
+        return 1, None
+
+
+class OfflineDatabase(dict):
+    """Enough of a Database for constructing models that are never asked to query."""
+
+    def __missing__(self, name):
+        return type("Collection", (), {"name": name})()
+
+
+def price_index(docs):
+    index = PriceIndex(OfflineDatabase(), type("Category", (), {"collection": "products"})())
+    index.versions = StaticVersions()
+    for doc in docs:
+        index._add(doc)
+    index._known = 1
+    return index
+
+
+def cases(items):
+    rng = random.Random(1)
+    docs = [{"_id": ObjectId(), "name": f"Product {i}", "price": rng.randint(500, 20000),
+             "image_url": f"earphones/{i:064x}.jpg"} for i in range(items)]
+    page_docs = docs[:20]
+    cursor = encode_cursor(docs[0], "price")
+    cache = TTLCache("micro", max_entries=items)
+    for doc in docs:
+        cache.set(("item", str(doc["_id"])), doc)
+    keys = [("item", str(doc["_id"])) for doc in docs[:1000]]
+    serialized = serialize_page(page_docs, ("name", "price", "image_url"))
+    states = [("earphones", (42, None)), ("earphone_details", (7, None))]
+    prices = price_index(docs)
+    range_page = RangeRequest(100000, 500000, "price", 20, None, ["name", "price", "image_url"])
+    registry = Registry()
+    histogram = registry.histogram("micro_seconds", "Micro.", ("route",))
+    formatter = JsonFormatter()
+    record = logging.LogRecord("soundbox.micro", logging.INFO, __file__, 1, "request", None, None)
+    record.route, record.status, record.duration_ms = "/earphones/<id>", 200, 1.5
+
+    return {
+        "encode_cursor": lambda: encode_cursor(docs[0], "price"),
+        "decode_cursor": lambda: decode_cursor(cursor, "price"),
+        "serialize_page_20": lambda: serialize_page(page_docs, ("name", "price", "image_url")),
+        "present_all_20": lambda: present_all(serialized),
+        "cache_get_hit_1000": lambda: [cache.get(key) for key in keys],
+        "compute_etag": lambda: compute_etag(states, "/earphones?limit=20&sort=price"),
+        "price_index_query": lambda: prices.query(range_page),
+        "histogram_observe": lambda: histogram.observe(0.0123, route="/earphones/<id>"),
+        "json_log_format": lambda: formatter.format(record),
+        "json_dumps_page_20": lambda: json.dumps(serialized),
+        "encode_page_20": lambda: encode(serialized),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000, help="Documents behind the cache and price index.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this.")
+    parser.add_argument("--out", help="Write the JSON results to this file as well.")
+    parser.add_argument("--baseline", help="Compare against an earlier --out file.")
+    args = parser.parse_args()
+
+    results = {"meta": metadata(items=args.items, repeat=args.repeat), "cases": {}}
+    for name, fn in cases(args.items).items():
+        if args.filter not in name:
+            continue
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=args.repeat, number=number)) / number
+        results["cases"][name] = {"us_per_call": round(best * 1e6, 3), "calls": number}
+
+    write_results(results, args.out)
+    if args.baseline:
+        with open(args.baseline) as f:
+            before = json.load(f).get("cases", {})
+        print(f"\nvs. baseline {args.baseline}, + is faster:")
+        for name, case in results["cases"].items():
+            if name in before:
+                change = (before[name]["us_per_call"] - case["us_per_call"]) / before[name]["us_per_call"] * 100
+                print(f"{name:<22}{change:>+9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
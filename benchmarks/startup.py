@@ -0,0 +1,84 @@
+"""Cold-start benchmark: import cost, create_app() time and first-request latency.
+
+Every run is a fresh interpreter, as on a new serverless or auto-scaled
+instance. No MongoDB is needed: the client connects lazily and the probed
+route does not query it.
+
+    python benchmarks/startup.py --runs 10 [--importtime 15] [--out startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+flask_app = app.create_app()
+t2 = time.perf_counter()
+response = flask_app.test_client().get("/cache/stats")
+t3 = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000,
+                  "first_request_ms": (t3 - t2) * 1000, "total_ms": (t3 - t0) * 1000}))
+"""
+
+
+def run_probe():
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def slowest_imports(limit):
+    """Top modules by cumulative import time (python -X importtime), in ms."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app; app.create_app()"],
+                         cwd=ROOT, check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative) / 1000, name))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(ms, 2)} for ms, name in rows[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="Also list the N slowest imports.")
+    parser.add_argument("--out", help="Write the JSON results to this file as well.")
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    results = {
+        "runs": args.runs,
+        "python": sys.version.split()[0],
+        **{
+            metric: {
+                "median": round(statistics.median(s[metric] for s in samples), 2),
+                "min": round(min(s[metric] for s in samples), 2),
+                "max": round(max(s[metric] for s in samples), 2),
+            }
+            for metric in ("import_ms", "create_app_ms", "first_request_ms", "total_ms")
+        },
+    }
+    if args.importtime:
+        results["slowest_imports"] = slowest_imports(args.importtime)
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+class Category:
+    """Declarative description of one product category.
+
+    Everything else (models, blueprints, URL rules, upload folders) is derived
+    from these few names, so a new category only needs a register_category call.
+    """
+
+    def __init__(self, name, singular, collection=None, detail_collection=None,
+                 foreign_key=None, upload_folder=None, max_image_bytes=None):
+        self.name = name                    # URL segment and blueprint name, e.g. "earphones"
+        self.singular = singular            # used in messages and detail routes, e.g. "earphone"
+        self.collection = collection or name
+        self.detail_collection = detail_collection or f"{singular}_details"
+        self.foreign_key = foreign_key or f"{singular}_id"
+        self.upload_folder = upload_folder or name
+        self.max_image_bytes = max_image_bytes    # None falls back to the MAX_IMAGE_BYTES setting
+
+    @property
+    def detail_route(self):
+        return f"{self.singular}-details"
+
+
+CATEGORIES = {}
+
+
+def register_category(category):
+    CATEGORIES[category.name] = category
+    return category
+
+
+register_category(Category("earphones", "earphone"))
+register_category(Category("headphones", "headphone"))
+register_category(Category("smartwatches", "smartwatch"))
@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import click
+from pymongo import UpdateOne
+from flask.cli import AppGroup
+from categories import CATEGORIES
+from models.index_manager import IndexManager
+from utils.versioning import CollectionVersions
+from utils.image_store import ImageStore
+from utils.thumbnails import get_thumbnails
+from utils.image_urls import image_key
+from models.price_index import price_to_minor
+from utils.snapshots import (
+    DEFAULT_BATCH_SIZE, Checkpoint, export_collection, import_snapshot, find_snapshots,
+)
+
+def catalog_collections():
+    names = []
+    for category in CATEGORIES.values():
+        names.extend([category.collection, category.detail_collection])
+    return names
+
+
+def bulk_in_batches(collection, operations, batch_size=DEFAULT_BATCH_SIZE):
+    """bulk_write an iterable of operations batch_size at a time; return how many were sent."""
+    sent, batch = 0, []
+    for operation in operations:
+        batch.append(operation)
+        if len(batch) >= batch_size:
+            collection.bulk_write(batch, ordered=False)
+            sent += len(batch)
+            batch = []
+    if batch:
+        collection.bulk_write(batch, ordered=False)
+        sent += len(batch)
+    return sent
+
+
+def register_cli(app, db, upload_root):
+    # `flask soundbox ...` maintenance commands, bound to this app's db
+    soundbox_cli = AppGroup("soundbox", help="SoundBox maintenance commands.")
+
+    @soundbox_cli.command("ensure-indexes")
+    def ensure_indexes():
+        """Create every index declared in models/index_manager.py."""
+        for collection, names in IndexManager(db).ensure_indexes().items():
+            click.echo(f"{collection}: {', '.join(names)}")
+
+    @soundbox_cli.command("verify-indexes")
+    def verify_indexes():
+        """Fail if any hot query is still a collection scan."""
+        IndexManager(db).verify_query_plans()
+        click.echo("All hot queries use an index")
+
+    @soundbox_cli.command("export")
+    @click.option("--out", "out_dir", default="exports", show_default=True, help="Target directory.")
+    @click.option("--collection", "collections", multiple=True, help="Collection to export (repeatable). Defaults to the catalog and detail collections.")
+    @click.option("--gzip", "compress", is_flag=True, help="Write .ndjson.gz files.")
+    @click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True)
+    @click.option("--jobs", default=4, show_default=True, help="Collections exported in parallel.")
+    @click.option("--restart", is_flag=True, help="Ignore an existing checkpoint and start over.")
+    def export_command(out_dir, collections, compress, batch_size, jobs, restart):
+        """Stream collections to NDJSON snapshots, resuming from the last checkpoint."""
+        os.makedirs(out_dir, exist_ok=True)
+        checkpoint = Checkpoint(os.path.join(out_dir, ".export-checkpoint.json"))
+        if restart:
+            checkpoint.clear()
+
+        collections = list(collections) or catalog_collections()
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            counts = pool.map(
+                lambda name: export_collection(db, name, out_dir, compress, batch_size, checkpoint),
+                collections,
+            )
+            for name, count in zip(collections, counts):
+                click.echo(f"{name}: {count} documents")
+        checkpoint.clear()
+
+    @soundbox_cli.command("import")
+    @click.argument("paths", nargs=-1, type=click.Path(exists=True))
+    @click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True)
+    @click.option("--jobs", default=4, show_default=True, help="Files imported in parallel.")
+    @click.option("--checkpoint", "checkpoint_path", default=".import-checkpoint.json", show_default=True)
+    @click.option("--restart", is_flag=True, help="Ignore an existing checkpoint and start over.")
+    def import_command(paths, batch_size, jobs, checkpoint_path, restart):
+        """Upsert NDJSON(.gz) snapshots or legacy exports/*.json arrays into MongoDB."""
+        files = find_snapshots(paths or ["exports"])
+        checkpoint = Checkpoint(checkpoint_path)
+        if restart:
+            checkpoint.clear()
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(
+                lambda path: import_snapshot(db, path, batch_size=batch_size, checkpoint=checkpoint),
+                files,
+            )
+            imported = set()
+            for path, (collection, count) in zip(files, results):
+                imported.add(collection)
+                click.echo(f"{path} -> {collection}: {count} documents")
+
+        # Read caches are keyed on the collection version, so the bump makes
+        # running workers stop serving what they cached before the import
+        versions = CollectionVersions(db)
+        for collection in imported:
+            versions.bump(collection)
+        # Imported documents replace others without going through save() and release()
+        ImageStore(db, upload_root).recount(db[name] for name in catalog_collections())
+        checkpoint.clear()
+
+    @soundbox_cli.command("gc-images")
+    def gc_images():
+        """Delete uploaded image blobs that no catalog or detail document references."""
+        for key in ImageStore(db, upload_root).collect_garbage():
+            click.echo(f"removed {key}")
+
+    @soundbox_cli.command("thumbnails")
+    def thumbnails():
+        """Generate resized variants for every image already in the upload folders."""
+        pipeline = get_thumbnails()
+        if not pipeline.enabled:
+            raise click.ClickException("Thumbnails are disabled or Pillow is not installed")
+        for category in CATEGORIES.values():
+            folder = os.path.join(upload_root, category.upload_folder)
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                if name.rsplit(".", 1)[-1].lower() in ("jpg", "jpeg", "png", "webp"):
+                    widths = pipeline.generate(category.upload_folder, name)
+                    click.echo(f"{category.upload_folder}/{name}: {', '.join(map(str, widths)) or 'original only'}")
+
+    @soundbox_cli.command("migrate-image-urls")
+    @click.option("--dry-run", is_flag=True, help="Only count the documents that would change.")
+    def migrate_image_urls(dry_run):
+        """Rewrite absolute image URLs (e.g. http://<ip>:5000/uploads/...) to "<folder>/<filename>" keys.
+
+        Run after importing old exports/; documents that already hold keys are left alone.
+        """
+        versions = CollectionVersions(db)
+        for name in catalog_collections():
+            collection = db[name]
+            query = {"image_url": {"$regex": "^(https?:)?/"}}
+            if dry_run:
+                click.echo(f"{name}: {collection.count_documents(query)} documents to rewrite")
+                continue
+            rewritten = bulk_in_batches(collection, (
+                UpdateOne({"_id": doc["_id"]}, {"$set": {"image_url": image_key(doc["image_url"])}})
+                for doc in collection.find(query, {"image_url": 1})
+            ))
+            if rewritten:
+                versions.bump(name)
+            click.echo(f"{name}: {rewritten} documents rewritten")
+
+    @soundbox_cli.command("backfill-price-minor")
+    def backfill_price_minor():
+        """Set the integer price_minor field on catalog documents written before it existed."""
+        versions = CollectionVersions(db)
+        for category in CATEGORIES.values():
+            collection = db[category.collection]
+            updated = bulk_in_batches(collection, (
+                UpdateOne({"_id": doc["_id"]}, {"$set": {"price_minor": price_to_minor(doc.get("price") or 0)}})
+                for doc in collection.find({"price_minor": {"$exists": False}}, {"price": 1})
+            ))
+            if updated:
+                versions.bump(category.collection)
+            click.echo(f"{category.collection}: {updated} documents updated")
+
+    app.cli.add_command(soundbox_cli)
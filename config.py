@@ -1,3 +1,85 @@
 import os
 class Config:
-    MONGO_URI = "mongodb://127.0.0.1:27017/soundbox"
\ No newline at end of file
+    MONGO_URI = os.environ.get("MONGO_URI", "mongodb://127.0.0.1:27017/soundbox")
+
+    # Connection pool and timeouts. Requests wait at most WAIT_QUEUE_TIMEOUT_MS for a pooled
+    # connection before failing; /health shows pool utilization and checkout waits.
+    MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 50))
+    MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get("MONGO_SOCKET_TIMEOUT_MS", 10000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    # "secondaryPreferred" serves catalog and detail GETs from secondaries lagging at most
+    # MONGO_MAX_STALENESS_SECONDS (90 minimum); auth and writes always use the primary, and so
+    # do reads of a collection written within that window, so caches never refill from a lagging node.
+    # A standalone mongod ignores it, so the same setting works locally.
+    CATALOG_READ_PREFERENCE = os.environ.get("CATALOG_READ_PREFERENCE", "primary")
+    MONGO_MAX_STALENESS_SECONDS = int(os.environ.get("MONGO_MAX_STALENESS_SECONDS", 90))
+
+    # Read cache for catalog and detail lookups
+    CACHE_TTL_SECONDS = int(os.environ.get("CACHE_TTL_SECONDS", 60))
+    CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 1024))
+    # Comma separated collection names to serve straight from MongoDB, e.g. "earphones,earphone_details"
+    CACHE_DISABLED_COLLECTIONS = [c for c in os.environ.get("CACHE_DISABLED_COLLECTIONS", "").split(",") if c]
+
+    # Create declared indexes and explain() the hot queries when the app starts.
+    # The same checks are available as `flask soundbox ensure-indexes` / `verify-indexes`.
+    ENSURE_INDEXES_ON_STARTUP = os.environ.get("ENSURE_INDEXES_ON_STARTUP", "0") == "1"
+
+    # Largest number of records accepted by one POST /<category>/bulk request
+    BULK_MAX_ITEMS = int(os.environ.get("BULK_MAX_ITEMS", 10000))
+
+    # Password hashing runs in a process pool; requests get 429 once MAX_PENDING jobs are queued.
+    # The default method is werkzeug's, which existing hashes were made with; changing it
+    # upgrades stored hashes on the next successful login.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = int(os.environ.get("PASSWORD_SALT_LENGTH", 16))
+    # Every gunicorn worker has its own pool, so the cores are shared out between WEB_CONCURRENCY workers
+    PASSWORD_HASH_WORKERS = int(os.environ.get(
+        "PASSWORD_HASH_WORKERS",
+        max(1, (os.cpu_count() or 1) // int(os.environ.get("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))),
+    ))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 64))
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+
+    # JWT signing secrets; set real values through the environment in production
+    USER_JWT_SECRET = os.environ.get("USER_JWT_SECRET", "your_secret_key")
+    ADMIN_JWT_SECRET = os.environ.get("ADMIN_JWT_SECRET", "your-secret-key")
+    # Require an admin bearer token on catalog/detail POST, PUT and DELETE
+    ADMIN_WRITE_AUTH = os.environ.get("ADMIN_WRITE_AUTH", "1") == "1"
+
+    # Resized JPEG/WebP variants of uploads (needs Pillow), served through ?w= on image routes
+    THUMBNAILS_ENABLED = os.environ.get("THUMBNAILS_ENABLED", "1") == "1"
+    THUMBNAIL_WORKERS = int(os.environ.get("THUMBNAIL_WORKERS", 2))
+    THUMBNAIL_WIDTHS = tuple(int(w) for w in os.environ.get("THUMBNAIL_WIDTHS", "160,320,640,1024").split(","))
+
+    # Upload serving: Cache-Control max-age for non content-addressed files and how long
+    # file metadata is cached for 304 checks. MEDIA_OFFLOAD hands the body to the front
+    # proxy: "x-sendfile" (Apache/lighttpd) or "x-accel" (nginx, internal location at
+    # MEDIA_ACCEL_PREFIX aliased to the uploads folder).
+    MEDIA_MAX_AGE = int(os.environ.get("MEDIA_MAX_AGE", 24 * 3600))
+    MEDIA_STAT_TTL = int(os.environ.get("MEDIA_STAT_TTL", 5))
+    MEDIA_OFFLOAD = os.environ.get("MEDIA_OFFLOAD") or None
+    MEDIA_ACCEL_PREFIX = os.environ.get("MEDIA_ACCEL_PREFIX", "/protected-uploads/")
+    USE_X_SENDFILE = MEDIA_OFFLOAD == "x-sendfile"
+
+    # Upload limits: requests over MAX_CONTENT_LENGTH are refused with 413 before being read.
+    # MAX_IMAGE_BYTES is the per-image default; a Category can set its own max_image_bytes.
+    MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))
+    MAX_IMAGE_BYTES = int(os.environ.get("MAX_IMAGE_BYTES", 5 * 1024 * 1024))
+
+    # Public origin for image links, e.g. a CDN ("https://cdn.example.com"). Documents only
+    # store "<folder>/<filename>" keys; unset means links use the requesting host.
+    PUBLIC_BASE_URL = os.environ.get("PUBLIC_BASE_URL", "")
+
+    # Per-route latency/size histograms, MongoDB command timings, pool and cache gauges at /metrics
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+    # Logs are JSON lines on stderr ("text" for development). A LOG_SAMPLE_RATE fraction of
+    # requests is logged, plus every request slower than LOG_SLOW_REQUEST_MS; repeated
+    # errors are logged once per LOG_RATE_LIMIT_SECONDS with a count of the suppressed ones.
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+    LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", 0.01))
+    LOG_SLOW_REQUEST_MS = int(os.environ.get("LOG_SLOW_REQUEST_MS", 500))
+    LOG_RATE_LIMIT_SECONDS = int(os.environ.get("LOG_RATE_LIMIT_SECONDS", 10))
@@ -0,0 +1,40 @@
+# gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Every setting can be overridden from the environment, e.g. WEB_CONCURRENCY=8.
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# Requests mostly wait on MongoDB, so each worker process runs a few threads.
+# (2 x cores) + 1 processes keeps every core busy while others wait on I/O.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Import the app once in the master and fork it, so workers share the loaded
+# code copy-on-write and start instantly. PyMongo is created with
+# connect=False, so no sockets or monitor threads exist before the fork.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# Keep connections from the load balancer open between requests; must be lower
+# than the balancer's idle timeout so it never reuses a socket we just closed.
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+# SIGHUP / SIGTERM let in-flight requests finish for this long before workers are killed
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# Recycle workers now and then so slow leaks never build up; the jitter keeps
+# them from all restarting at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+# Graceful reload: `kill -HUP <master>` starts new workers and retires the old
+# ones once their requests finish. With preload_app the master keeps the old
+# code, so deploy new code with `kill -USR2 <master>` (starts a new master),
+# then `kill -TERM <old master>`.
+
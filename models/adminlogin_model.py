@@ -1,5 +1,4 @@
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_pymongo import PyMongo
+from utils.passwords import get_hasher
 
 class AdminModel:
     def __init__(self, db):
@@ -11,7 +10,7 @@ class AdminModel:
 
     def create_admin(self, name, email, password):
         """Insert a new admin into the database."""
-        hashed_password = generate_password_hash(password)
+        hashed_password = get_hasher().hash(password)
         admin_data = {
             "name": name,
             "email": email,
@@ -24,6 +23,19 @@ class AdminModel:
         """Retrieve an admin by email."""
         return self.collection.find_one({"email": email})
 
-    def check_password(self, stored_password, provided_password):
-        """Check if the provided password matches the stored hashed password."""
-        return check_password_hash(stored_password, provided_password)
+    def authenticate(self, email, password):
+        """Return the admin if the credentials match, otherwise None.
+
+        Unknown emails cost the same as a wrong password, and hashes made with
+        outdated parameters are upgraded on a successful login.
+        """
+        hasher = get_hasher()
+        admin = self.get_admin_by_email(email)
+        if not admin:
+            hasher.verify_dummy(password)
+            return None
+        if not hasher.verify(admin["password"], password):
+            return None
+        if hasher.needs_rehash(admin["password"]):
+            self.collection.update_one({"_id": admin["_id"]}, {"$set": {"password": hasher.hash(password)}})
+        return admin
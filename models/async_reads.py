@@ -0,0 +1,114 @@
+from contextvars import ContextVar
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+from utils.cache import get_cache
+from utils.mongo_pool import catalog_reads, client_options
+from utils.pagination import SORT_KEYS, page_query, serialize_page, split_page
+from models.category_model import CategoryModel, RELATED_LIMIT, RELATED_SORT, related_filter, serialize_item
+from models.category_details_model import serialize_detail
+from utils.logs import get_logger
+
+try:
+    # PyMongo's native asyncio client (4.9+)
+    from pymongo import AsyncMongoClient
+except ImportError:
+    from motor.motor_asyncio import AsyncIOMotorClient as AsyncMongoClient
+
+log = get_logger("models.async_reads")
+
+# Counters already read in the current request; set by the async conditional decorator
+request_states = ContextVar("request_states", default=None)
+
+
+def async_client(config):
+    """Async MongoClient with the same pool sizing, timeouts and monitoring as the sync one."""
+    return AsyncMongoClient(config["MONGO_URI"], **client_options(config))
+
+
+class AsyncCollectionVersions:
+    """CollectionVersions.get and get_states over the async driver."""
+
+    def __init__(self, db):
+        self.collection = db["collection_versions"]
+
+    async def get(self, name):
+        return (await self.get_states([name]))[name]
+
+    async def get_states(self, names):
+        """Return {name: (version, updated_at)}, querying only collections not read yet in this request."""
+        known = request_states.get()
+        if known is None:
+            known = {}
+        missing = [name for name in names if name not in known]
+        if missing:
+            fetched = {name: (0, None) for name in missing}
+            async for doc in self.collection.find({"_id": {"$in": missing}}):
+                fetched[doc["_id"]] = (doc["version"], doc.get("updated_at"))
+            known.update(fetched)
+        return {name: known[name] for name in names}
+
+
+class AsyncCategoryReads:
+    """Catalog and detail reads of one category over the async driver.
+
+    Mirrors the read methods of CategoryModel and CategoryDetailsModel and
+    shares their caches, so the two apps serve identical payloads; writes
+    stay on the sync models.
+    """
+
+    FIELDS = CategoryModel.FIELDS
+
+    def __init__(self, db, category):
+        self.category = category
+        self.foreign_key = category.foreign_key
+        self.items = db[category.collection]
+        self.details = db[category.detail_collection]
+        self.cache = get_cache(category.collection)
+        self.details_cache = get_cache(category.detail_collection)
+        self.versions = AsyncCollectionVersions(db)
+
+    async def read_state(self, collection):
+        """(version, source) for a read, as CategoryModel.read_state."""
+        version, updated_at = await self.versions.get(collection.name)
+        return version, catalog_reads(collection, updated_at)
+
+    async def get_page(self, page):
+        """Return (items, next_cursor) for a PageRequest, served from the cache when possible."""
+        version, items = await self.read_state(self.items)
+        return await self.cache.get_or_load_async((version, page.cache_key), lambda: self._load_page(items, page))
+
+    async def _load_page(self, items, page):
+        query, projection = page_query(page)
+        cursor = items.find(query, projection).sort(SORT_KEYS[page.sort]).limit(page.limit + 1)
+        docs, next_cursor = split_page(await cursor.to_list(None), page)
+        return serialize_page(docs, page.fields), next_cursor
+
+    async def get_item_by_id(self, item_id):
+        version, items = await self.read_state(self.items)
+        return await self.cache.get_or_load_async(("item", version, item_id), lambda: self._load_item(items, item_id))
+
+    async def _load_item(self, items, item_id):
+        try:
+            item = await items.find_one({"_id": ObjectId(item_id)})
+            return serialize_item(item) if item else None
+        except PyMongoError as e:
+            log.error("Error retrieving item", extra={"error": str(e)})
+            return None
+
+    async def get_details_for_parent(self, parent_id):
+        version, details_source = await self.read_state(self.details)
+        details = self.details_cache.get(("parent", version, parent_id))
+        if details is None:
+            docs = await details_source.find({self.foreign_key: parent_id}).to_list(None)
+            details = [serialize_detail(doc, "_id", self.foreign_key) for doc in docs]
+            self.details_cache.set(("parent", version, parent_id), details)
+        return details
+
+    async def get_related(self, item):
+        version, items = await self.read_state(self.items)
+        key = ("related", version, item["_id"])
+        return await self.cache.get_or_load_async(key, lambda: self._load_related(items, item))
+
+    async def _load_related(self, items, item):
+        cursor = items.find(related_filter(item), {field: 1 for field in self.FIELDS})
+        return serialize_page(await cursor.sort(RELATED_SORT).limit(RELATED_LIMIT).to_list(None), self.FIELDS)
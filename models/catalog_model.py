@@ -0,0 +1,110 @@
+from pymongo.errors import PyMongoError
+from categories import CATEGORIES
+from utils.cache import get_cache
+from utils.versioning import CollectionVersions
+from utils.pagination import SORT_KEYS, encode_cursor, keyset_filter
+from utils.mongo_pool import catalog_reads
+from utils.logs import get_logger
+
+log = get_logger("models.catalog")
+
+CATALOG_FIELDS = ("name", "price", "image_url", "category")
+DETAIL_FIELDS = ("name", "price", "image_url", "description")
+
+
+class CatalogModel:
+    """Mixed feed over every category's catalog collection, read with one aggregation.
+
+    The first category's collection is the pipeline source and the others are
+    appended with $unionWith; sorting, keyset paging and the optional details
+    $lookup all run on the server in the same round-trip. Each branch applies
+    the keyset $match, $sort and $limit itself, so it can walk its sort index
+    and contributes at most one page before the union is merged and cut.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.categories = list(CATEGORIES.values())
+        self.cache = get_cache("catalog")
+        self.versions = CollectionVersions(db)
+
+    @property
+    def collections(self):
+        return [name for category in self.categories
+                for name in (category.collection, category.detail_collection)]
+
+    def _branch(self, category, page, projection):
+        stages = []
+        if page.after:
+            stages.append({"$match": keyset_filter(page.sort, page.after)})
+        stages.append({"$sort": dict(SORT_KEYS[page.sort])})
+        stages.append({"$limit": page.limit + 1})
+        stages.append({"$project": {**projection, "category": {"$literal": category.name}}})
+        return stages
+
+    def pipeline(self, page, include_details=False):
+        projection = {field: 1 for field in page.fields if field != "category"}
+        for field, _ in SORT_KEYS[page.sort]:
+            projection.setdefault(field, 1)
+
+        first, *rest = self.categories
+        stages = self._branch(first, page, projection)
+        for category in rest:
+            stages.append({"$unionWith": {
+                "coll": category.collection,
+                "pipeline": self._branch(category, page, projection),
+            }})
+        # Merge the per-category pages
+        stages.append({"$sort": dict(SORT_KEYS[page.sort])})
+        stages.append({"$limit": page.limit + 1})
+
+        if include_details:
+            # Detail documents reference their parent by string id. A product only
+            # matches in its own category's detail collection since _ids are unique.
+            stages.append({"$addFields": {"_parent": {"$toString": "$_id"}}})
+            for category in self.categories:
+                stages.append({"$lookup": {
+                    "from": category.detail_collection,
+                    "localField": "_parent",
+                    "foreignField": category.foreign_key,
+                    "as": f"_details_{category.name}",
+                }})
+            stages.append({"$addFields": {"details": {"$concatArrays": [
+                f"$_details_{category.name}" for category in self.categories
+            ]}}})
+            stages.append({"$project": {"_parent": 0, **{
+                f"_details_{category.name}": 0 for category in self.categories
+            }}})
+        return stages
+
+    def get_page(self, page, include_details=False):
+        """Return (items, next_cursor); one cache entry per page and collection versions."""
+        states = self.versions.get_states(self.collections)
+        key = (tuple((name, version) for name, (version, _) in states.items()), page.cache_key, include_details)
+        # The pipeline reads every collection, so the most recent write decides the source
+        stamps = [updated_at for _, updated_at in states.values() if updated_at]
+        reads = catalog_reads(self.db, max(stamps) if stamps else None)
+        return self.cache.get_or_load(key, lambda: self._load_page(reads, page, include_details))
+
+    def _load_page(self, reads, page, include_details):
+        try:
+            first = self.categories[0]
+            docs = list(reads[first.collection].aggregate(self.pipeline(page, include_details)))
+        except PyMongoError as e:
+            log.error("Error retrieving catalog", extra={"error": str(e)})
+            return None
+
+        next_cursor = None
+        if len(docs) > page.limit:
+            docs = docs[:page.limit]
+            next_cursor = encode_cursor(docs[-1], page.sort)
+        items = []
+        for doc in docs:
+            item = {"_id": str(doc["_id"]), **{field: doc.get(field) for field in page.fields}}
+            if include_details:
+                item["details"] = [
+                    {"_id": str(detail["_id"]), **{field: detail.get(field) for field in DETAIL_FIELDS}}
+                    for detail in doc.get("details", [])
+                ]
+            items.append(item)
+        return items, next_cursor
@@ -0,0 +1,185 @@
+from pymongo.errors import PyMongoError
+from bson.objectid import ObjectId
+from utils.cache import get_cache
+from utils.versioning import CollectionVersions
+from models.category_model import parse_price, build_document
+from utils.bulk import run_bulk
+from utils.mongo_pool import catalog_reads
+from utils.json_provider import FragmentCache
+from models.search_index import get_search_index
+from utils.logs import get_logger
+
+log = get_logger("models.category_details")
+
+
+def serialize_detail(item, id_field, foreign_key):
+    return {
+        id_field: str(item["_id"]),
+        "name": item["name"],
+        "price": item["price"],
+        "image_url": item["image_url"],
+        "description": item["description"],
+        foreign_key: item[foreign_key]
+    }
+
+
+class CategoryDetailsModel:
+    """Detail collection of one registered category, linked to the catalog by category.foreign_key."""
+
+    def __init__(self, db, category):
+        self.category = category
+        self.foreign_key = category.foreign_key
+        self.collection = db[category.detail_collection]
+        self.parents = db[category.collection]
+        self.fields = ("name", "price", "image_url", "description", self.foreign_key)
+        self.cache = get_cache(category.detail_collection)
+        self.versions = CollectionVersions(db)
+        # Encoded JSON of list items, keyed on the same collection version as the read cache
+        self.fragments = FragmentCache(category.detail_collection, self.versions)
+
+    def mark_changed(self):
+        """Drop cached reads and bump the collection version after a write."""
+        self.cache.invalidate()
+        self.fragments.invalidate()
+        self.versions.bump(self.collection.name)
+
+    def read_state(self):
+        """(version, source) for a read, as CategoryModel.read_state."""
+        version, updated_at = self.versions.get(self.collection.name)
+        return version, catalog_reads(self.collection, updated_at)
+
+    def reindex(self, detail_id, parent_id=None):
+        search = get_search_index()
+        if search:
+            search.refresh_detail(self.category, detail_id, parent_id)
+
+    def _serialize(self, item, id_field):
+        return serialize_detail(item, id_field, self.foreign_key)
+
+    def create_detail(self, detail_data):
+        try:
+            item = {
+                "name": detail_data["name"],
+                "price": parse_price(detail_data["price"]),
+                "image_url": detail_data["image_url"],
+                "description": detail_data["description"],
+                self.foreign_key: detail_data[self.foreign_key]
+            }
+            result = self.collection.insert_one(item)
+            self.mark_changed()
+            self.reindex(result.inserted_id, item[self.foreign_key])
+            # Return the inserted ID along with a success message
+            return {"id": str(result.inserted_id), "message": "Detail created successfully"}
+        except PyMongoError as e:
+            log.error("Error creating item", extra={"error": str(e)})
+            return None
+
+    def get_all_details(self):
+        version, reads = self.read_state()
+        details = self.cache.get_or_load(("all", version), lambda: self._load_all_details(reads))
+        return details if details is not None else []
+
+    def _load_all_details(self, reads):
+        try:
+            return [self._serialize(item, "_id") for item in reads.find()]
+        except PyMongoError as e:
+            log.error("Error retrieving items", extra={"error": str(e)})
+            return None
+
+    def get_detail_by_id(self, item_id, fresh=False):
+        """fresh=True reads the primary and bypasses the cache, for write paths."""
+        if fresh:
+            return self._load_detail(item_id, self.collection)
+        version, reads = self.read_state()
+        return self.cache.get_or_load(("item", version, item_id), lambda: self._load_detail(item_id, reads))
+
+    def _load_detail(self, item_id, collection):
+        try:
+            item = collection.find_one({"_id": ObjectId(item_id)})
+            if item:
+                return self._serialize(item, "id")
+            return None
+        except PyMongoError as e:
+            log.error("Error retrieving item", extra={"error": str(e)})
+            return None
+
+    def get_details_for_parent(self, parent_id):
+        """Return every detail of one catalog item, using the foreign-key index."""
+        return self.get_details_for_parents([parent_id])[parent_id]
+
+    def get_details_for_parents(self, parent_ids):
+        """Return {parent_id: [details]} for a batch of catalog items.
+
+        Parents already in the cache are served from it, the rest are fetched
+        with a single $in query instead of one round-trip per parent.
+        """
+        version, reads = self.read_state()
+        result = {}
+        missing = []
+        for parent_id in parent_ids:
+            details = self.cache.get(("parent", version, parent_id))
+            if details is None:
+                missing.append(parent_id)
+            else:
+                result[parent_id] = details
+
+        if missing:
+            fetched = {parent_id: [] for parent_id in missing}
+            for item in reads.find({self.foreign_key: {"$in": missing}}):
+                fetched[item[self.foreign_key]].append(self._serialize(item, "_id"))
+            for parent_id, details in fetched.items():
+                self.cache.set(("parent", version, parent_id), details)
+            result.update(fetched)
+        return result
+
+    def update_detail(self, item_id, update_data):
+        try:
+            if "price" in update_data:
+                update_data["price"] = parse_price(update_data["price"])
+
+            result = self.collection.update_one(
+                {"_id": ObjectId(item_id)}, {"$set": update_data}
+            )
+            self.mark_changed()
+            self.reindex(item_id, update_data.get(self.foreign_key))
+            return result.modified_count > 0
+        except PyMongoError as e:
+            log.error("Error updating item", extra={"error": str(e)})
+            return False
+
+    def delete_detail(self, item_id):
+        try:
+            result = self.collection.delete_one({"_id": ObjectId(item_id)})
+            self.mark_changed()
+            self.reindex(item_id)
+            return result.deleted_count > 0
+        except PyMongoError as e:
+            log.error("Error deleting item", extra={"error": str(e)})
+            return False
+
+    def bulk_write(self, records, images=None):
+        """Apply a batch of create/update/delete records in one round-trip.
+
+        Parent references are checked with a single $in query on the catalog.
+        With an ImageStore, blob refcounts follow the image_url changes.
+        """
+        parent_ids = {}
+        for index, record in enumerate(records):
+            if isinstance(record, dict) and record.get(self.foreign_key):
+                parent_ids[index] = record[self.foreign_key]
+
+        valid = {ObjectId(pid) for pid in parent_ids.values() if ObjectId.is_valid(pid)}
+        existing = {str(doc["_id"]) for doc in self.parents.find({"_id": {"$in": list(valid)}}, {"_id": 1})} if valid else set()
+        rejected = {
+            index: f"Invalid {self.category.singular} ID"
+            for index, pid in parent_ids.items() if pid not in existing
+        }
+
+        results = run_bulk(
+            self.collection, records,
+            lambda record, partial: build_document(record, self.fields, partial),
+            rejected=rejected,
+            images=images,
+        )
+        self.mark_changed()
+        return results
@@ -0,0 +1,200 @@
+import math
+from pymongo.errors import PyMongoError
+from bson import ObjectId
+from utils.cache import get_cache
+from utils.versioning import CollectionVersions
+from utils.pagination import fetch_page, serialize_page
+from utils.bulk import run_bulk
+from utils.mongo_pool import catalog_reads
+from utils.image_urls import image_key
+from utils.json_provider import FragmentCache
+from models.search_index import get_search_index
+from models.price_index import get_price_index, price_to_minor
+from utils.logs import get_logger
+
+log = get_logger("models.category")
+
+
+def parse_price(price):
+    """Accept prices as numbers or strings like "4,999".
+
+    NaN, infinities and values too large for price_to_minor raise ValueError.
+    """
+    value = float(str(price).replace(",", ""))
+    if not math.isfinite(value * 100):
+        raise ValueError(f"Price out of range: {price}")
+    return value
+
+
+def build_document(record, fields, partial):
+    """Pick and validate the stored fields of a bulk record; partial=True for updates."""
+    document = {field: record[field] for field in fields if field in record}
+    if partial:
+        if not document:
+            raise ValueError("No fields to update")
+    else:
+        missing = [field for field in fields if not document.get(field)]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    if document.get("image_url"):
+        document["image_url"] = image_key(document["image_url"])
+    if "price" in document:
+        try:
+            document["price"] = parse_price(document["price"])
+        except ValueError:
+            raise ValueError("Invalid price format")
+    return document
+
+
+def serialize_item(item):
+    return {
+        "_id": str(item["_id"]),
+        "id": str(item["_id"]),
+        "name": item["name"],
+        "price": item["price"],
+        "image_url": item["image_url"]
+    }
+
+
+# Related items: same category, priced within RELATED_PRICE_SPREAD of the item
+RELATED_LIMIT = 4
+RELATED_PRICE_SPREAD = 0.2
+RELATED_SORT = [("price", 1), ("_id", 1)]
+
+
+def related_filter(item):
+    price = item.get("price") or 0
+    return {
+        "_id": {"$ne": ObjectId(item["_id"])},
+        "price": {"$gte": price * (1 - RELATED_PRICE_SPREAD), "$lte": price * (1 + RELATED_PRICE_SPREAD)},
+    }
+
+
+class CategoryModel:
+    """Catalog collection of one registered category."""
+
+    FIELDS = ("name", "price", "image_url")
+
+    def __init__(self, db, category):
+        self.category = category
+        self.collection = db[category.collection]
+        self.cache = get_cache(category.collection)
+        self.versions = CollectionVersions(db)
+        # Encoded JSON of list items, keyed on the same collection version as the read cache
+        self.fragments = FragmentCache(category.collection, self.versions)
+
+    def mark_changed(self):
+        """Drop cached reads and bump the collection version after a write."""
+        self.cache.invalidate()
+        self.fragments.invalidate()
+        self.versions.bump(self.collection.name)
+
+    def read_state(self):
+        """Return (version, source) for a read.
+
+        Every cache key includes the collection version. The source is the
+        catalog read preference, or the primary right after a write.
+        """
+        version, updated_at = self.versions.get(self.collection.name)
+        return version, catalog_reads(self.collection, updated_at)
+
+    def reindex(self, item_id):
+        search = get_search_index()
+        if search:
+            search.refresh_product(self.category, item_id)
+        prices = get_price_index(self.category)
+        if prices:
+            prices.refresh(item_id)
+
+    def create_item(self, name, price, image_url):
+        try:
+            price = parse_price(price)
+            item = {
+                "name": name,
+                "price": price,
+                "price_minor": price_to_minor(price),
+                "image_url": image_url
+            }
+            result = self.collection.insert_one(item)
+            self.mark_changed()
+            self.reindex(result.inserted_id)
+            return str(result.inserted_id)
+        except PyMongoError as e:
+            log.error("Error creating item", extra={"error": str(e)})
+            return None
+
+    def get_page(self, page):
+        """Return (items, next_cursor) for a PageRequest, served from the cache when possible."""
+        version, reads = self.read_state()
+        return self.cache.get_or_load((version, page.cache_key), lambda: self._load_page(reads, page))
+
+    def _load_page(self, reads, page):
+        items, next_cursor = fetch_page(reads, page)
+        return serialize_page(items, page.fields), next_cursor
+
+    def get_item_by_id(self, item_id, fresh=False):
+        """fresh=True reads the primary and bypasses the cache, for write paths."""
+        if fresh:
+            return self._load_item(item_id, self.collection)
+        version, reads = self.read_state()
+        return self.cache.get_or_load(("item", version, item_id), lambda: self._load_item(item_id, reads))
+
+    def _load_item(self, item_id, collection):
+        try:
+            item = collection.find_one({"_id": ObjectId(item_id)})
+            if item:
+                return serialize_item(item)
+            return None
+        except PyMongoError as e:
+            log.error("Error retrieving item", extra={"error": str(e)})
+            return None
+
+    def get_related(self, item):
+        """A few other items of the category at a similar price."""
+        version, reads = self.read_state()
+        return self.cache.get_or_load(("related", version, item["_id"]), lambda: self._load_related(reads, item))
+
+    def _load_related(self, reads, item):
+        docs = reads.find(related_filter(item), {field: 1 for field in self.FIELDS})
+        return serialize_page(docs.sort(RELATED_SORT).limit(RELATED_LIMIT), self.FIELDS)
+
+    def update_item(self, item_id, update_data):
+        try:
+            if "price" in update_data:
+                update_data["price"] = parse_price(update_data["price"])
+                update_data["price_minor"] = price_to_minor(update_data["price"])
+
+            result = self.collection.update_one(
+                {"_id": ObjectId(item_id)}, {"$set": update_data}
+            )
+            self.mark_changed()
+            self.reindex(item_id)
+            return result.modified_count > 0
+        except PyMongoError as e:
+            log.error("Error updating item", extra={"error": str(e)})
+            return False
+
+    def delete_item(self, item_id):
+        try:
+            result = self.collection.delete_one({"_id": ObjectId(item_id)})
+            self.mark_changed()
+            self.reindex(item_id)
+            return result.deleted_count > 0
+        except PyMongoError as e:
+            log.error("Error deleting item", extra={"error": str(e)})
+            return False
+
+    def bulk_write(self, records, images=None):
+        """Apply a batch of create/update/delete records in one round-trip.
+
+        With an ImageStore, blob refcounts follow the image_url changes.
+        """
+        def build(record, partial):
+            document = build_document(record, self.FIELDS, partial)
+            if "price" in document:
+                document["price_minor"] = price_to_minor(document["price"])
+            return document
+
+        results = run_bulk(self.collection, records, build, images=images)
+        self.mark_changed()
+        return results
@@ -0,0 +1,92 @@
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+from categories import CATEGORIES
+
+
+class IndexVerificationError(RuntimeError):
+    """Raised when a hot query is still answered by a collection scan."""
+
+
+def declared_indexes():
+    """Return {collection: [IndexModel, ...]} for every index the app relies on."""
+    indexes = {
+        "signup": [IndexModel([("email", ASCENDING)], unique=True)],
+        "adminlogin": [IndexModel([("email", ASCENDING)], unique=True)],
+    }
+    for category in CATEGORIES.values():
+        indexes[category.collection] = [
+            # Keyset pagination on price ends on _id, see utils/pagination.py
+            IndexModel([("price", ASCENDING), ("_id", ASCENDING)]),
+            # Range queries and sorting on the integer price, see models/price_index.py
+            IndexModel([("price_minor", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("name", ASCENDING)]),
+        ]
+        indexes[category.detail_collection] = [
+            IndexModel([(category.foreign_key, ASCENDING)]),
+        ]
+    return indexes
+
+
+def hot_queries():
+    """Return (label, collection, filter, sort) tuples for the queries that must use an index."""
+    queries = [
+        ("signup by email", "signup", {"email": "probe@example.com"}, None),
+        ("adminlogin by email", "adminlogin", {"email": "probe@example.com"}, None),
+    ]
+    for category in CATEGORIES.values():
+        queries.append((
+            f"{category.collection} sorted by price",
+            category.collection, {"price": {"$gt": 0}}, [("price", ASCENDING), ("_id", ASCENDING)],
+        ))
+        queries.append((
+            f"{category.collection} in a price_minor range",
+            category.collection, {"price_minor": {"$gte": 0, "$lte": 100000}},
+            [("price_minor", ASCENDING), ("_id", ASCENDING)],
+        ))
+        queries.append((
+            f"{category.detail_collection} by {category.foreign_key}",
+            category.detail_collection, {category.foreign_key: "000000000000000000000000"}, None,
+        ))
+    return queries
+
+
+def _plan_stages(plan):
+    """Yield every stage name of an explain() plan, whatever the server's plan layout."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _plan_stages(value)
+
+
+class IndexManager:
+    def __init__(self, db):
+        self.db = db
+
+    def ensure_indexes(self):
+        """Create any missing declared index. Existing indexes are left untouched."""
+        created = {}
+        for collection, indexes in declared_indexes().items():
+            try:
+                created[collection] = self.db[collection].create_indexes(indexes)
+            except PyMongoError as e:
+                # Typically duplicate emails blocking a unique index
+                raise IndexVerificationError(f"Could not create indexes on {collection}: {e}")
+        return created
+
+    def verify_query_plans(self):
+        """Explain every hot query and raise if any winning plan contains a COLLSCAN."""
+        offenders = []
+        for label, collection, query, sort in hot_queries():
+            cursor = self.db[collection].find(query).limit(1)
+            if sort:
+                cursor = cursor.sort(sort)
+            plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+            if "COLLSCAN" in set(_plan_stages(plan)):
+                offenders.append(label)
+        if offenders:
+            raise IndexVerificationError(f"Queries still doing a COLLSCAN: {', '.join(offenders)}")
+        return True
@@ -1,4 +1,4 @@
-from werkzeug.security import check_password_hash
+from utils.passwords import get_hasher
 
 class LoginModel:
     def __init__(self, db):
@@ -8,6 +8,19 @@ class LoginModel:
         """Retrieve a user by email."""
         return self.collection.find_one({"email": email})
 
-    def check_password(self, stored_password, provided_password):
-        """Check if the provided password matches the stored hashed password."""
-        return check_password_hash(stored_password, provided_password)
+    def authenticate(self, email, password):
+        """Return the user if the credentials match, otherwise None.
+
+        Unknown emails cost the same as a wrong password, and hashes made with
+        outdated parameters are upgraded on a successful login.
+        """
+        hasher = get_hasher()
+        user = self.get_user_by_email(email)
+        if not user:
+            hasher.verify_dummy(password)
+            return None
+        if not hasher.verify(user["password"], password):
+            return None
+        if hasher.needs_rehash(user["password"]):
+            self.collection.update_one({"_id": user["_id"]}, {"$set": {"password": hasher.hash(password)}})
+        return user
@@ -0,0 +1,197 @@
+import bisect
+import math
+import threading
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+from utils.versioning import CollectionVersions
+from utils.services import get_service, set_service
+from utils.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PaginationError, decode_cursor, encode_cursor,
+)
+from utils.logs import get_logger
+
+log = get_logger("models.price_index")
+
+RANGE_ARGS = ("price_min", "price_max", "order")
+ORDERS = {"price": "price_minor", "-price": "-price_minor"}
+# Sorts after every hex ObjectId, so (price, LAST_ID) closes a price range
+LAST_ID = "~"
+
+
+def price_to_minor(price):
+    """Integer price in minor units ("4,999.50" -> 499950), exact for range queries and sorting."""
+    minor = float(str(price).replace(",", "")) * 100
+    if not math.isfinite(minor):
+        raise ValueError(f"Price out of range: {price}")
+    return int(round(minor))
+
+
+class RangeRequest:
+    def __init__(self, price_min, price_max, order, limit, after, fields):
+        self.price_min = price_min
+        self.price_max = price_max
+        self.order = order
+        self.limit = limit
+        self.after = after
+        self.fields = fields
+
+
+def is_range_request(args):
+    return any(name in args for name in RANGE_ARGS)
+
+
+def parse_range_args(args, allowed_fields):
+    """Parse price_min/price_max/order/limit/after/fields from the request query string."""
+    bounds = []
+    for name in ("price_min", "price_max"):
+        value = args.get(name)
+        try:
+            bounds.append(price_to_minor(value) if value not in (None, "") else None)
+        except (ValueError, OverflowError):
+            raise PaginationError(f"Invalid {name}")
+
+    order = args.get("order", "price")
+    if order not in ORDERS:
+        raise PaginationError(f"Invalid order, expected one of: {', '.join(ORDERS)}")
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise PaginationError("Invalid limit")
+    if limit < 1:
+        raise PaginationError("Invalid limit")
+
+    fields = list(allowed_fields)
+    if args.get("fields"):
+        fields = [f.strip() for f in args["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in allowed_fields]
+        if unknown:
+            raise PaginationError(f"Unknown fields: {', '.join(unknown)}")
+
+    after = None
+    if args.get("after"):
+        price_minor, oid = decode_cursor(args["after"], ORDERS[order])
+        # Compared against the int keys of the index by bisect; None or a float would raise there
+        if type(price_minor) is not int:
+            raise PaginationError("Invalid cursor")
+        after = (price_minor, str(oid))
+    return RangeRequest(*bounds, order, min(limit, MAX_PAGE_SIZE), after, fields)
+
+
+class PriceIndex:
+    """Sorted (price_minor, id) array of one category with the item summaries it points at.
+
+    Range and price-ordered pages are two bisects and a slice, so they run in
+    O(log n + k) without a MongoDB query. Writes through CategoryModel update
+    single entries; any other change to the collection is noticed through its
+    version counter and triggers a rebuild on the next query.
+    """
+
+    def __init__(self, db, category):
+        self.collection = db[category.collection]
+        self.versions = CollectionVersions(db)
+        self._lock = threading.Lock()
+        self._keys = []    # sorted (price_minor, id)
+        self._items = {}   # id -> (price_minor, summary)
+        self._known = None
+
+    @staticmethod
+    def _entry(doc):
+        price_minor = doc.get("price_minor")
+        if price_minor is None:
+            # Documents written before price_minor existed
+            price_minor = price_to_minor(doc.get("price") or 0)
+        item_id = str(doc["_id"])
+        return price_minor, item_id, {
+            "_id": item_id,
+            "name": doc.get("name"),
+            "price": doc.get("price"),
+            "image_url": doc.get("image_url"),
+        }
+
+    def _remove(self, item_id):
+        current = self._items.pop(item_id, None)
+        if current:
+            del self._keys[bisect.bisect_left(self._keys, (current[0], item_id))]
+
+    def _add(self, doc):
+        price_minor, item_id, summary = self._entry(doc)
+        self._remove(item_id)
+        bisect.insort(self._keys, (price_minor, item_id))
+        self._items[item_id] = (price_minor, summary)
+
+    def sync(self):
+        version, _ = self.versions.get(self.collection.name)
+        with self._lock:
+            if version == self._known:
+                return
+            docs = self.collection.find({}, {"name": 1, "price": 1, "price_minor": 1, "image_url": 1})
+            entries = [self._entry(doc) for doc in docs]
+            self._keys = sorted((price_minor, item_id) for price_minor, item_id, _ in entries)
+            self._items = {item_id: (price_minor, summary) for price_minor, item_id, summary in entries}
+            self._known = version
+
+    def refresh(self, item_id):
+        """Re-read one item after a write through the model."""
+        try:
+            doc = self.collection.find_one(
+                {"_id": ObjectId(item_id)}, {"name": 1, "price": 1, "price_minor": 1, "image_url": 1}
+            )
+            version, _ = self.versions.get(self.collection.name)
+            with self._lock:
+                if doc:
+                    self._add(doc)
+                else:
+                    self._remove(str(item_id))
+                # Only our own write happened since the last sync, otherwise rebuild later
+                if self._known == version - 1:
+                    self._known = version
+        except PyMongoError as e:
+            log.error("Error refreshing price index", extra={"error": str(e)})
+
+    def query(self, page):
+        """Return (items, next_cursor) for a RangeRequest."""
+        self.sync()
+        low = (page.price_min, "") if page.price_min is not None else None
+        high = (page.price_max, LAST_ID) if page.price_max is not None else None
+        with self._lock:
+            start = bisect.bisect_left(self._keys, low) if low else 0
+            end = bisect.bisect_right(self._keys, high) if high else len(self._keys)
+            if page.order == "price":
+                if page.after:
+                    start = max(start, bisect.bisect_right(self._keys, page.after))
+                keys = self._keys[start:min(end, start + page.limit + 1)]
+            else:
+                if page.after:
+                    end = min(end, bisect.bisect_left(self._keys, page.after))
+                keys = self._keys[max(start, end - page.limit - 1):end][::-1]
+            items = [self._items[item_id][1] for _, item_id in keys]
+
+        next_cursor = None
+        if len(items) > page.limit:
+            keys, items = keys[:page.limit], items[:page.limit]
+            price_minor, item_id = keys[-1]
+            next_cursor = encode_cursor({"price_minor": price_minor, "_id": item_id}, ORDERS[page.order])
+        fields = ["_id", *page.fields]
+        return [{field: item[field] for field in fields} for item in items], next_cursor
+
+
+class PriceIndexes:
+    """The PriceIndex of every category over one app's database, built on first use."""
+
+    def __init__(self, db):
+        self.db = db
+        self._indexes = {}
+
+    def get(self, category):
+        if category.name not in self._indexes:
+            self._indexes[category.name] = PriceIndex(self.db, category)
+        return self._indexes[category.name]
+
+
+def configure_price_indexes(app, db):
+    return set_service(app, "price_indexes", PriceIndexes(db))
+
+
+def get_price_index(category):
+    indexes = get_service("price_indexes")
+    return indexes.get(category) if indexes else None
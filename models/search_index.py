@@ -0,0 +1,252 @@
+import bisect
+import re
+import threading
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+from categories import CATEGORIES
+from utils.versioning import CollectionVersions
+from utils.services import get_service, set_service
+from utils.logs import get_logger
+
+log = get_logger("models.search_index")
+
+TOKEN = re.compile(r"[a-z0-9]+")
+# Upper bounds of the price facet buckets; the last bucket is open ended
+PRICE_BUCKETS = (1000, 2000, 5000, 10000)
+SORTS = {
+    "relevance": lambda entry, score: (-score, entry["name"].lower()),
+    "price": lambda entry, score: (entry["price"], entry["name"].lower()),
+    "-price": lambda entry, score: (-entry["price"], entry["name"].lower()),
+    "name": lambda entry, score: (entry["name"].lower(), entry["price"]),
+}
+
+
+class SearchError(ValueError):
+    """Raised when the search query parameters are invalid."""
+
+
+def tokenize(text):
+    return TOKEN.findall(str(text or "").lower())
+
+
+def price_bucket(price):
+    low = 0
+    for high in PRICE_BUCKETS:
+        if price < high:
+            return low, high
+        low = high
+    return low, None
+
+
+class SearchIndex:
+    """In-process inverted index over every category's products and their details.
+
+    Tokens of a product's name, and of its details' names and descriptions,
+    point at the product. A sorted token list gives prefix matching for
+    typeahead. Writes through the models update single products in place;
+    writes made elsewhere (other workers, bulk, imports) are noticed through
+    the collection version counters and trigger a rebuild of that category.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.versions = CollectionVersions(db)
+        self._lock = threading.RLock()
+        self._entries = {}        # (category, id) -> product summary
+        self._name_tokens = {}    # (category, id) -> tokens of the product name
+        self._doc_tokens = {}     # (category, id) -> every token pointing at the product
+        self._postings = {}       # token -> {(category, id)}
+        self._tokens = []         # sorted keys of _postings
+        self._detail_parents = {} # (category, detail id) -> parent id
+        self._known = {}          # collection -> version this index reflects
+
+    # Maintenance
+
+    def _unindex(self, key):
+        for token in self._doc_tokens.pop(key, ()):
+            postings = self._postings[token]
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect.bisect_left(self._tokens, token)]
+        self._entries.pop(key, None)
+        self._name_tokens.pop(key, None)
+
+    def _index(self, category, item, details):
+        key = (category.name, str(item["_id"]))
+        self._unindex(key)
+        name_tokens = set(tokenize(item.get("name")))
+        tokens = set(name_tokens)
+        for detail in details:
+            tokens.update(tokenize(detail.get("name")))
+            tokens.update(tokenize(detail.get("description")))
+            self._detail_parents[(category.name, str(detail["_id"]))] = key[1]
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                bisect.insort(self._tokens, token)
+            self._postings[token].add(key)
+        self._doc_tokens[key] = tokens
+        self._name_tokens[key] = name_tokens
+        self._entries[key] = {
+            "_id": key[1],
+            "category": category.name,
+            "name": item.get("name", ""),
+            "price": item.get("price") or 0,
+            "image_url": item.get("image_url"),
+        }
+
+    def _rebuild(self, category):
+        items = list(self.db[category.collection].find({}, {"name": 1, "price": 1, "image_url": 1}))
+        details = {}
+        for detail in self.db[category.detail_collection].find({}, {"name": 1, "description": 1, category.foreign_key: 1}):
+            details.setdefault(str(detail.get(category.foreign_key)), []).append(detail)
+        for key in [key for key in self._entries if key[0] == category.name]:
+            self._unindex(key)
+        self._detail_parents = {k: v for k, v in self._detail_parents.items() if k[0] != category.name}
+        for item in items:
+            self._index(category, item, details.get(str(item["_id"]), []))
+
+    def sync(self):
+        """Rebuild every category whose collections changed behind this index's back."""
+        current = self.versions.get_many([
+            name for category in CATEGORIES.values()
+            for name in (category.collection, category.detail_collection)
+        ])
+        with self._lock:
+            for category in CATEGORIES.values():
+                names = (category.collection, category.detail_collection)
+                if any(self._known.get(name) != current[name] for name in names):
+                    self._rebuild(category)
+                    for name in names:
+                        self._known[name] = current[name]
+
+    def _note_write(self, collection):
+        # Our own write bumped the version by exactly one; anything more means
+        # another writer got in between and the next sync() must rebuild.
+        version, _ = self.versions.get(collection)
+        if self._known.get(collection) == version - 1:
+            self._known[collection] = version
+
+    def _reindex_product(self, category, item_id):
+        item = self.db[category.collection].find_one(
+            {"_id": ObjectId(item_id)}, {"name": 1, "price": 1, "image_url": 1}
+        )
+        details = list(self.db[category.detail_collection].find(
+            {category.foreign_key: str(item_id)}, {"name": 1, "description": 1}
+        )) if item else []
+        with self._lock:
+            if item:
+                self._index(category, item, details)
+            else:
+                self._unindex((category.name, str(item_id)))
+
+    def refresh_product(self, category, item_id):
+        """Re-read one catalog item and its details after a write through the model."""
+        try:
+            self._reindex_product(category, item_id)
+            with self._lock:
+                self._note_write(category.collection)
+        except PyMongoError as e:
+            log.error("Error refreshing search index", extra={"error": str(e)})
+
+    def refresh_detail(self, category, detail_id, parent_id=None):
+        """Re-index the products a detail belonged to before and after a write."""
+        try:
+            with self._lock:
+                previous = self._detail_parents.pop((category.name, str(detail_id)), None)
+            for product_id in {previous, parent_id} - {None}:
+                if ObjectId.is_valid(product_id):
+                    self._reindex_product(category, product_id)
+            with self._lock:
+                self._note_write(category.detail_collection)
+        except PyMongoError as e:
+            log.error("Error refreshing search index", extra={"error": str(e)})
+
+    # Queries
+
+    def _candidates(self, tokens):
+        """Products matching every query token, by prefix; None when the query is empty."""
+        matched = None
+        for token in tokens:
+            keys = set()
+            position = bisect.bisect_left(self._tokens, token)
+            while position < len(self._tokens) and self._tokens[position].startswith(token):
+                keys |= self._postings[self._tokens[position]]
+                position += 1
+            matched = keys if matched is None else matched & keys
+            if not matched:
+                return set()
+        return matched
+
+    def _score(self, key, tokens):
+        name_tokens = self._name_tokens[key]
+        doc_tokens = self._doc_tokens[key]
+        score = 0
+        for token in tokens:
+            if token in name_tokens:
+                score += 3
+            elif any(t.startswith(token) for t in name_tokens):
+                score += 2
+            elif token in doc_tokens:
+                score += 1
+        return score
+
+    def search(self, q="", category=None, min_price=None, max_price=None, sort="relevance",
+               limit=20, offset=0):
+        """Return {"total", "results", "facets"} for a query.
+
+        The category facet ignores the category filter and the price facet the
+        price filter, so clients can show the counts of the other choices.
+        """
+        if sort not in SORTS:
+            raise SearchError(f"Unknown sort: {sort}")
+        if category and category not in CATEGORIES:
+            raise SearchError(f"Unknown category: {category}")
+        self.sync()
+
+        tokens = tokenize(q)
+        with self._lock:
+            keys = self._candidates(tokens)
+            if keys is None:
+                keys = set(self._entries)
+            entries = [(self._entries[key], self._score(key, tokens)) for key in keys]
+
+        def in_price(entry):
+            return ((min_price is None or entry["price"] >= min_price)
+                    and (max_price is None or entry["price"] <= max_price))
+
+        category_facet = {name: 0 for name in CATEGORIES}
+        price_facet = {}
+        matches = []
+        for entry, score in entries:
+            in_category = category is None or entry["category"] == category
+            if in_price(entry):
+                category_facet[entry["category"]] += 1
+            if in_category:
+                bucket = price_bucket(entry["price"])
+                price_facet[bucket] = price_facet.get(bucket, 0) + 1
+                if in_price(entry):
+                    matches.append((entry, score))
+
+        order = SORTS[sort]
+        matches.sort(key=lambda match: order(*match))
+        return {
+            "total": len(matches),
+            "results": [entry for entry, _ in matches[offset:offset + limit]],
+            "facets": {
+                "category": category_facet,
+                "price": [
+                    {"min": low, "max": high, "count": count}
+                    for (low, high), count in sorted(price_facet.items())
+                ],
+            },
+        }
+
+
+def configure_search(app, db):
+    return set_service(app, "search", SearchIndex(db))
+
+
+def get_search_index():
+    return get_service("search")
@@ -1,5 +1,4 @@
-from werkzeug.security import generate_password_hash
-from flask_pymongo import PyMongo
+from utils.passwords import get_hasher
 
 class UserModel:
     def __init__(self, db):
@@ -11,7 +10,7 @@ class UserModel:
 
     def create_user(self, name, email, password):
         """Insert a new user into the database."""
-        hashed_password = generate_password_hash(password)
+        hashed_password = get_hasher().hash(password)
         user_data = {
             "name": name,
             "email": email,
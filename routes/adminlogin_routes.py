@@ -1,16 +1,13 @@
 import jwt
 import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 import re
 from models.adminlogin_model import AdminModel
+from utils.passwords import HasherBusy
 
-# Blueprint setup
-admin_bp = Blueprint("admin", __name__)
-
-# Directly define the SECRET_KEY here
-SECRET_KEY = "your-secret-key"  # Set your secret key here
-
+# Blueprint factory; a fresh blueprint per app so create_app() can run more than once
 def setup_admin_routes(db):
+    admin_bp = Blueprint("admin", __name__)
     admin_model = AdminModel(db)
 
     # Admin signup route
@@ -36,7 +33,10 @@ def setup_admin_routes(db):
             return jsonify({"error": "Email already registered"}), 400
 
         # Create new admin
-        admin_model.create_admin(name, email, password)
+        try:
+            admin_model.create_admin(name, email, password)
+        except HasherBusy:
+            return jsonify({"error": "Too many requests, please retry"}), 429, {"Retry-After": "1"}
         return jsonify({"message": "Admin registered successfully"}), 201
 
     # Admin login route
@@ -57,8 +57,11 @@ def setup_admin_routes(db):
             return jsonify({"error": "Invalid email address"}), 400
 
         # Check if admin exists and password matches
-        admin = admin_model.get_admin_by_email(email)
-        if not admin or not admin_model.check_password(admin["password"], password):
+        try:
+            admin = admin_model.authenticate(email, password)
+        except HasherBusy:
+            return jsonify({"error": "Too many requests, please retry"}), 429, {"Retry-After": "1"}
+        if not admin:
             return jsonify({"error": "Invalid email or password"}), 401
 
         # Generate JWT token
@@ -66,7 +69,7 @@ def setup_admin_routes(db):
             "admin_id": str(admin["_id"]),
             "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=1)  # Token expires in 1 hour
         }
-        token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+        token = jwt.encode(payload, current_app.config["ADMIN_JWT_SECRET"], algorithm="HS256")
 
         return jsonify({"message": "Admin login successful", "token": token}), 200
 
@@ -0,0 +1,117 @@
+import asyncio
+from functools import wraps
+from pymongo.errors import PyMongoError
+from quart import Blueprint, request, jsonify, make_response
+from models.async_reads import AsyncCategoryReads, request_states
+from models.price_index import is_range_request
+from utils.image_urls import present, present_all
+from utils.logs import get_logger
+from utils.pagination import PaginationError, parse_page_args, set_next_cursor
+from utils.versioning import validators, is_not_modified
+
+log = get_logger("routes.async_catalog")
+
+# Constants
+PRODUCT_FIELDS = ("name", "price", "image_url")
+
+
+def conditional(versions, *collections):
+    """utils.versioning.conditional for async views.
+
+    The counters are read in one query and kept for the request, so the read
+    caches are keyed on the same versions as the ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            # Each request runs in its own task, so the context variable is per request
+            request_states.set({})
+            try:
+                states = list((await versions.get_states(collections)).items())
+            except PyMongoError as e:
+                log.error("Error reading collection versions", extra={"error": str(e)})
+                return jsonify({"error": "Catalog temporarily unavailable"}), 503
+            etag, last_modified = validators(states, request.full_path)
+
+            if is_not_modified(request, etag, last_modified):
+                response = await make_response("", 304)
+            else:
+                response = await make_response(await view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
+
+
+# Blueprint factory for the async app: the GET routes of one category's catalog and details
+def create_async_category_routes(db, category):
+    bp = Blueprint(f"async_{category.name}", __name__)
+    model = AsyncCategoryReads(db, category)
+
+    # Route: Fetch a page of items (?limit=&after=&sort=&fields=)
+    @bp.route(f"/{category.name}", methods=["GET"])
+    @conditional(model.versions, category.collection, category.detail_collection)
+    async def get_all_items():
+        if is_range_request(request.args) or request.args.get("include"):
+            # Price ranges and includes are served by the sync app
+            return jsonify({"message": "Not supported by the async app"}), 400
+        try:
+            page = parse_page_args(request.args, PRODUCT_FIELDS)
+        except PaginationError as e:
+            return jsonify({"message": str(e)}), 400
+
+        try:
+            items, next_cursor = await model.get_page(page)
+            items = present_all(items, request.host_url)
+            return set_next_cursor(jsonify(items), request, next_cursor), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching {category.name}: {str(e)}"}), 500
+
+    # Route: Fetch an item by ID
+    @bp.route(f"/{category.name}/<id>", methods=["GET"])
+    @conditional(model.versions, category.collection)
+    async def get_item_by_id(id):
+        try:
+            item = await model.get_item_by_id(id)
+            if not item:
+                return jsonify({"message": f"{category.name} not found"}), 404
+            return jsonify(present(item, request.host_url)), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching {category.singular}: {str(e)}"}), 500
+
+    # Route: Fetch every detail of an item
+    @bp.route(f"/{category.name}/<id>/details", methods=["GET"])
+    @conditional(model.versions, category.collection, category.detail_collection)
+    async def get_item_details(id):
+        try:
+            item, details = await asyncio.gather(model.get_item_by_id(id), model.get_details_for_parent(id))
+            if not item:
+                return jsonify({"message": f"{category.name} not found"}), 404
+            return jsonify(present_all(details, request.host_url)), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching details: {str(e)}"}), 500
+
+    # Route: Product page; the item and its details are fetched concurrently
+    @bp.route(f"/{category.name}/<id>/page", methods=["GET"])
+    @conditional(model.versions, category.collection, category.detail_collection)
+    async def get_item_page(id):
+        try:
+            item, details = await asyncio.gather(model.get_item_by_id(id), model.get_details_for_parent(id))
+            if not item:
+                return jsonify({"message": f"{category.name} not found"}), 404
+            # Related items need the item's price, so they are the one dependent round-trip
+            related = await model.get_related(item)
+            return jsonify({
+                "item": present(item, request.host_url),
+                "details": present_all(details, request.host_url),
+                "related": present_all(related, request.host_url),
+            }), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching {category.singular}: {str(e)}"}), 500
+
+    return bp
@@ -0,0 +1,12 @@
+from flask import Blueprint, jsonify
+from utils.cache import cache_stats
+
+def create_cache_routes():
+    cache_bp = Blueprint('cache', __name__)
+
+    # Route: Hit/miss/eviction counters for every read cache
+    @cache_bp.route("/cache/stats", methods=["GET"])
+    def get_cache_stats():
+        return jsonify(cache_stats()), 200
+
+    return cache_bp
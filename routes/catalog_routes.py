@@ -0,0 +1,40 @@
+from flask import Blueprint, request, jsonify
+from models.catalog_model import CatalogModel, CATALOG_FIELDS
+from utils.image_urls import present, present_all
+from utils.pagination import PaginationError, parse_page_args, set_next_cursor
+from utils.versioning import conditional
+
+INCLUDES = {"details"}
+
+
+def create_catalog_routes(db):
+    catalog_bp = Blueprint("catalog", __name__)
+    model = CatalogModel(db)
+
+    # Route: One page of products across every category (?limit=&after=&sort=price|-price|recent&include=details)
+    @catalog_bp.route("/catalog", methods=["GET"])
+    @conditional(model.versions, *model.collections)
+    def get_catalog():
+        try:
+            page = parse_page_args(request.args, CATALOG_FIELDS)
+        except PaginationError as e:
+            return jsonify({"message": str(e)}), 400
+
+        include = {i for i in request.args.get("include", "").split(",") if i}
+        if include - INCLUDES:
+            return jsonify({"message": f"Unknown include: {', '.join(sorted(include - INCLUDES))}"}), 400
+
+        try:
+            result = model.get_page(page, "details" in include)
+            if result is None:
+                return jsonify({"message": "Error fetching catalog"}), 500
+            items, next_cursor = result
+            items = [
+                present({**item, "details": present_all(item["details"])}) if "details" in item else present(item)
+                for item in items
+            ]
+            return set_next_cursor(jsonify(items), request, next_cursor), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching catalog: {str(e)}"}), 500
+
+    return catalog_bp
@@ -0,0 +1,153 @@
+from flask import Blueprint, request, jsonify, current_app
+from bson.objectid import ObjectId
+from models.category_details_model import CategoryDetailsModel
+from models.category_model import parse_price
+from utils.versioning import conditional
+from utils.auth import admin_write_guard
+from utils.image_store import ImageStore, ImageRejected, max_image_bytes, upload_size_guard
+from utils.thumbnails import get_thumbnails
+from utils.image_urls import present
+from utils.bulk import BulkRequestError, parse_bulk_records, summarize
+
+# Blueprint factory, one details blueprint per registered category
+def create_category_details_routes(db, category, upload_root):
+    details_bp = Blueprint(f"{category.singular}_details", __name__)
+    details_model = CategoryDetailsModel(db, category)
+    foreign_key = category.foreign_key
+
+    # Creating, updating and deleting details requires an admin token
+    details_bp.before_request(admin_write_guard)
+    details_bp.before_request(upload_size_guard(category))
+
+    images = ImageStore(db, upload_root)
+
+    # Documents store the image key "<folder>/<filename>"; URLs are built per response
+    def save_image(image):
+        filename = images.save(image, category.upload_folder, max_image_bytes(category))
+        get_thumbnails().submit(category.upload_folder, filename)
+        return f"{category.upload_folder}/{filename}"
+
+    # POST: Create a new detail
+    @details_bp.route(f"/{category.detail_route}", methods=["POST"])
+    def create_detail():
+        try:
+            name = request.form.get("name")
+            description = request.form.get("description")
+            price = request.form.get("price")
+            parent_id = request.form.get(foreign_key)
+            image = request.files.get("image")
+
+            # Validate required fields
+            if not all([name, description, price, parent_id, image]):
+                return jsonify({"message": "Missing required fields"}), 400
+
+            try:
+                price = parse_price(price)
+            except ValueError:
+                return jsonify({"message": "Invalid price format"}), 400
+
+            # Ensure the parent exists in the catalog collection
+            if not db[category.collection].find_one({"_id": ObjectId(parent_id)}):
+                return jsonify({"message": f"Invalid {category.singular} ID"}), 400
+
+            # Create detail data
+            detail_data = {
+                "name": name,
+                "description": description,
+                "price": price,
+                "image_url": save_image(image),
+                foreign_key: parent_id
+            }
+
+            # Insert into MongoDB
+            created_detail = details_model.create_detail(detail_data)
+
+            if created_detail:
+                return jsonify(created_detail), 201  # Return the response with the ID
+            else:
+                images.release(detail_data["image_url"])
+                return jsonify({"message": "Error creating detail"}), 500
+        except ImageRejected as e:
+            return jsonify({"message": str(e)}), e.status
+        except Exception as e:
+            return jsonify({"message": f"Error creating detail: {str(e)}"}), 500
+
+    # POST: Bulk create/update/delete from a JSON array or NDJSON body
+    @details_bp.route(f"/{category.detail_route}/bulk", methods=["POST"])
+    def bulk_details():
+        try:
+            records = parse_bulk_records(request, current_app.config["BULK_MAX_ITEMS"])
+        except BulkRequestError as e:
+            return jsonify({"message": str(e)}), 400
+
+        try:
+            return jsonify(summarize(details_model.bulk_write(records, images))), 200
+        except Exception as e:
+            return jsonify({"message": f"Error in bulk write: {str(e)}"}), 500
+
+    # GET: Fetch all details
+    @details_bp.route(f"/{category.detail_route}", methods=["GET"])
+    @conditional(details_model.versions, category.detail_collection)
+    def get_all_details():
+        try:
+            return details_model.fragments.response(details_model.get_all_details()), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching details: {str(e)}"}), 500
+
+    # GET: Fetch a detail by ID
+    @details_bp.route(f"/{category.detail_route}/<id>", methods=["GET"])
+    @conditional(details_model.versions, category.detail_collection)
+    def get_detail_by_id(id):
+        try:
+            detail = details_model.get_detail_by_id(id)
+            if not detail:
+                return jsonify({"message": "Detail not found"}), 404
+            return jsonify(present(detail)), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching detail: {str(e)}"}), 500
+
+    # PUT: Update a detail by ID
+    @details_bp.route(f"/{category.detail_route}/<id>", methods=["PUT"])
+    def update_detail(id):
+        try:
+            detail = details_model.get_detail_by_id(id, fresh=True)
+            if not detail:
+                return jsonify({"message": "Detail not found"}), 404
+
+            updated_data = request.form.to_dict()
+            # Validate before storing the upload, so a bad price cannot leave an orphaned blob
+            if "price" in updated_data:
+                try:
+                    parse_price(updated_data["price"])
+                except ValueError:
+                    return jsonify({"message": "Invalid price format"}), 400
+
+            if "image" in request.files:
+                updated_data["image_url"] = save_image(request.files.get("image"))
+
+            updated_detail = details_model.update_detail(id, updated_data)
+            if "image_url" in updated_data:
+                # The document holds one reference: the new blob if the write went through, else the old one
+                images.release(detail["image_url"] if updated_detail else updated_data["image_url"])
+            if not updated_detail:
+                return jsonify({"message": "Detail not found"}), 404
+            return jsonify(updated_detail), 200
+        except ImageRejected as e:
+            return jsonify({"message": str(e)}), e.status
+        except Exception as e:
+            return jsonify({"message": f"Error updating detail: {str(e)}"}), 500
+
+    # DELETE: Delete a detail by ID
+    @details_bp.route(f"/{category.detail_route}/<id>", methods=["DELETE"])
+    def delete_detail(id):
+        try:
+            detail = details_model.get_detail_by_id(id, fresh=True)
+            result = detail and details_model.delete_detail(id)
+            if not result:
+                return jsonify({"message": "Detail not found"}), 404
+            images.release(detail["image_url"])
+            return jsonify(result), 200
+        except Exception as e:
+            return jsonify({"message": f"Error deleting detail: {str(e)}"}), 500
+
+    return details_bp
@@ -0,0 +1,217 @@
+from flask import Blueprint, request, jsonify, current_app
+from werkzeug.exceptions import NotFound
+import os
+from models.category_model import CategoryModel, parse_price
+from models.category_details_model import CategoryDetailsModel
+from utils.versioning import conditional
+from utils.auth import admin_write_guard
+from utils.image_store import ImageStore, ImageRejected, is_blob_name, max_image_bytes, upload_size_guard
+from utils.media import get_media
+from utils.thumbnails import get_thumbnails
+from utils.image_urls import present, present_all, public_url
+from utils.bulk import BulkRequestError, parse_bulk_records, summarize
+from utils.pagination import PaginationError, parse_page_args, set_next_cursor
+from models.price_index import get_price_index, is_range_request, parse_range_args
+
+# Constants
+PRODUCT_FIELDS = ("name", "price", "image_url")
+INCLUDES = {"details"}
+
+# Blueprint factory, one blueprint per registered category
+def create_category_routes(db, category, upload_root):
+    bp = Blueprint(category.name, __name__)
+    model = CategoryModel(db, category)
+    details_model = CategoryDetailsModel(db, category)
+    # Created by ImageStore.save on the first upload
+    upload_folder = os.path.join(upload_root, category.upload_folder)
+
+    # Creating, updating and deleting items requires an admin token
+    bp.before_request(admin_write_guard)
+    bp.before_request(upload_size_guard(category))
+
+    images = ImageStore(db, upload_root)
+
+    # Documents store the image key "<folder>/<filename>"; URLs are built per response
+    def save_image(image):
+        filename = images.save(image, category.upload_folder, max_image_bytes(category))
+        # Resized variants are produced in the background
+        get_thumbnails().submit(category.upload_folder, filename)
+        return f"{category.upload_folder}/{filename}"
+
+    # Route: Create an item
+    @bp.route(f"/{category.name}", methods=["POST"])
+    def create_item():
+        try:
+            name = request.form.get("name")
+            price = request.form.get("price")
+            image = request.files.get("image")
+
+            if not all([name, price, image]):
+                return jsonify({"message": "Missing required fields"}), 400
+
+            try:
+                price = parse_price(price)
+            except ValueError:
+                return jsonify({"message": "Invalid price format"}), 400
+
+            # Save the image and insert into database
+            image_url = save_image(image)
+            item_id = model.create_item(name, price, image_url)
+            if not item_id:
+                images.release(image_url)
+                return jsonify({"message": f"Error creating {category.singular}"}), 500
+
+            return jsonify({"name": name, "price": price, "image_url": public_url(image_url), "_id": item_id}), 201
+        except ImageRejected as e:
+            return jsonify({"message": str(e)}), e.status
+        except Exception as e:
+            return jsonify({"message": f"Error creating {category.singular}: {str(e)}"}), 500
+
+    # Route: Bulk create/update/delete from a JSON array or NDJSON body
+    @bp.route(f"/{category.name}/bulk", methods=["POST"])
+    def bulk_items():
+        try:
+            records = parse_bulk_records(request, current_app.config["BULK_MAX_ITEMS"])
+        except BulkRequestError as e:
+            return jsonify({"message": str(e)}), 400
+
+        try:
+            return jsonify(summarize(model.bulk_write(records, images))), 200
+        except Exception as e:
+            return jsonify({"message": f"Error in bulk write: {str(e)}"}), 500
+
+    # Route: Fetch a page of items (?limit=&after=&sort=&fields=&include=details),
+    # or a price range from the in-memory price index (?price_min=&price_max=&order=price|-price)
+    @bp.route(f"/{category.name}", methods=["GET"])
+    @conditional(model.versions, category.collection, category.detail_collection)
+    def get_all_items():
+        price_range = is_range_request(request.args)
+        try:
+            if price_range:
+                page = parse_range_args(request.args, PRODUCT_FIELDS)
+            else:
+                page = parse_page_args(request.args, PRODUCT_FIELDS)
+        except PaginationError as e:
+            return jsonify({"message": str(e)}), 400
+
+        include = {i for i in request.args.get("include", "").split(",") if i}
+        if include - INCLUDES:
+            return jsonify({"message": f"Unknown include: {', '.join(sorted(include - INCLUDES))}"}), 400
+
+        try:
+            if price_range:
+                items, next_cursor = get_price_index(category).query(page)
+            else:
+                items, next_cursor = model.get_page(page)
+            if "details" in include:
+                # One $in query for the whole page instead of one per item
+                details = details_model.get_details_for_parents([item["_id"] for item in items])
+                items = [{**item, "details": present_all(details[item["_id"]])} for item in items]
+                return set_next_cursor(jsonify(present_all(items)), request, next_cursor), 200
+            # Items are joined from pre-encoded JSON fragments
+            return set_next_cursor(model.fragments.response(items), request, next_cursor), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching {category.name}: {str(e)}"}), 500
+
+    # Route: Fetch an item by ID
+    @bp.route(f"/{category.name}/<id>", methods=["GET"])
+    @conditional(model.versions, category.collection)
+    def get_item_by_id(id):
+        try:
+            item = model.get_item_by_id(id)
+            if not item:
+                return jsonify({"message": f"{category.name} not found"}), 404
+            return jsonify(present(item)), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching {category.singular}: {str(e)}"}), 500
+
+    # Route: Fetch every detail of an item
+    @bp.route(f"/{category.name}/<id>/details", methods=["GET"])
+    @conditional(model.versions, category.collection, category.detail_collection)
+    def get_item_details(id):
+        try:
+            if not model.get_item_by_id(id):
+                return jsonify({"message": f"{category.name} not found"}), 404
+            return details_model.fragments.response(details_model.get_details_for_parent(id)), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching details: {str(e)}"}), 500
+
+    # Route: Product page, the item with its details and related items
+    @bp.route(f"/{category.name}/<id>/page", methods=["GET"])
+    @conditional(model.versions, category.collection, category.detail_collection)
+    def get_item_page(id):
+        try:
+            item = model.get_item_by_id(id)
+            if not item:
+                return jsonify({"message": f"{category.name} not found"}), 404
+            return jsonify({
+                "item": present(item),
+                "details": present_all(details_model.get_details_for_parent(id)),
+                "related": present_all(model.get_related(item)),
+            }), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching {category.singular}: {str(e)}"}), 500
+
+    # Route: Update an item
+    @bp.route(f"/{category.name}/<id>", methods=["PUT"])
+    def update_item(id):
+        try:
+            item = model.get_item_by_id(id, fresh=True)
+            if not item:
+                return jsonify({"message": f"{category.name} not found"}), 404
+
+            updated_data = request.form.to_dict()
+            # Validate before storing the upload, so a bad price cannot leave an orphaned blob
+            if "price" in updated_data:
+                try:
+                    parse_price(updated_data["price"])
+                except ValueError:
+                    return jsonify({"message": "Invalid price format"}), 400
+
+            if "image" in request.files:
+                updated_data["image_url"] = save_image(request.files["image"])
+
+            updated = model.update_item(id, updated_data)
+            if "image_url" in updated_data:
+                # The document holds one reference: the new blob if the write went through, else the old one
+                images.release(item["image_url"] if updated else updated_data["image_url"])
+            return jsonify(present(model.get_item_by_id(id, fresh=True))), 200
+        except ImageRejected as e:
+            return jsonify({"message": str(e)}), e.status
+        except Exception as e:
+            return jsonify({"message": f"Error updating {category.singular}: {str(e)}"}), 500
+
+    # Route: Delete an item
+    @bp.route(f"/{category.name}/<id>", methods=["DELETE"])
+    def delete_item(id):
+        try:
+            item = model.get_item_by_id(id, fresh=True)
+            if not item or not model.delete_item(id):
+                return jsonify({"message": f"{category.singular} not found"}), 404
+            images.release(item["image_url"])
+            return jsonify({"message": f"{category.singular} deleted successfully"}), 200
+        except Exception as e:
+            return jsonify({"message": f"Error deleting {category.singular}: {str(e)}"}), 500
+
+    # Route: Serve an uploaded image, or with ?w= the nearest precomputed variant
+    @bp.route(f"/uploads/{category.upload_folder}/<filename>")
+    def serve_image(filename):
+        try:
+            width = request.args.get("w", type=int)
+            variant = None
+            if width:
+                webp = "image/webp" in request.headers.get("Accept", "")
+                variant = get_thumbnails().pick_variant(category.upload_folder, filename, width, webp)
+            # A ?w= fallback to the original may be replaced by a variant later
+            immutable = is_blob_name(filename) and bool(variant or not width)
+            if variant:
+                response = get_media().send(os.path.dirname(variant), os.path.basename(variant), immutable)
+            else:
+                response = get_media().send(upload_folder, filename, immutable)
+            if width:
+                response.vary.add("Accept")
+            return response
+        except NotFound:
+            return jsonify({"message": "File not found"}), 404
+
+    return bp
@@ -0,0 +1,35 @@
+import time
+from flask import Blueprint, jsonify
+from pymongo.errors import PyMongoError
+from utils.mongo_pool import pool_stats
+
+
+def create_health_routes(db):
+    health_bp = Blueprint("health", __name__)
+
+    # Route: Liveness, never touches MongoDB
+    @health_bp.route("/health/live", methods=["GET"])
+    def live():
+        return jsonify({"status": "ok"}), 200
+
+    # Route: Readiness, pings MongoDB and reports the connection pools
+    @health_bp.route("/health", methods=["GET"])
+    def health():
+        mongo = {}
+        status = 200
+        try:
+            started = time.perf_counter()
+            db.command("ping")
+            mongo["ping_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            mongo["status"] = "ok"
+        except PyMongoError as e:
+            mongo["status"] = "unavailable"
+            mongo["error"] = str(e)
+            status = 503
+        return jsonify({
+            "status": "ok" if status == 200 else "unavailable",
+            "mongo": mongo,
+            "pools": pool_stats(),
+        }), status
+
+    return health_bp
@@ -1,15 +1,13 @@
 import jwt
 import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 import re
 from models.login_model import LoginModel
+from utils.passwords import HasherBusy
 
-login_bp = Blueprint("login", __name__)
-
-# Secret key for signing the token (this should be stored securely, e.g., in environment variables)
-SECRET_KEY = "your_secret_key"
-
+# Blueprint factory; a fresh blueprint per app so create_app() can run more than once
 def setup_login_routes(db):
+    login_bp = Blueprint("login", __name__)
     login_model = LoginModel(db)
 
     @login_bp.route("/login", methods=["POST"])
@@ -28,9 +26,12 @@ def setup_login_routes(db):
         if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
             return jsonify({"error": "Invalid email address"}), 400
 
-        # Check credentials
-        user = login_model.get_user_by_email(email)
-        if not user or not login_model.check_password(user["password"], password):
+        # Check credentials (hashing runs in a bounded pool, 429 when it is saturated)
+        try:
+            user = login_model.authenticate(email, password)
+        except HasherBusy:
+            return jsonify({"error": "Too many requests, please retry"}), 429, {"Retry-After": "1"}
+        if not user:
             return jsonify({"error": "Invalid email or password"}), 401
 
         # Generate token
@@ -39,7 +40,7 @@ def setup_login_routes(db):
             "email": user["email"],
             "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=1),  # Token expiry
         }
-        token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+        token = jwt.encode(payload, current_app.config["USER_JWT_SECRET"], algorithm="HS256")
 
         return jsonify({"message": "Login successful", "token": token}), 200
 
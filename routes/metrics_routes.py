@@ -0,0 +1,15 @@
+from flask import Blueprint, Response
+from utils.metrics import get_registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_metrics_routes():
+    metrics_bp = Blueprint("metrics", __name__)
+
+    # Route: Request, MongoDB, pool and cache metrics of this worker in the Prometheus text format
+    @metrics_bp.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(get_registry().render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    return metrics_bp
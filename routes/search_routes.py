@@ -0,0 +1,49 @@
+from flask import Blueprint, request, jsonify
+from categories import CATEGORIES
+from models.category_model import parse_price
+from models.search_index import SearchError, get_search_index
+from utils.image_urls import present_all
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.versioning import CollectionVersions, conditional
+
+
+def _price_arg(name):
+    value = request.args.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return parse_price(value)
+    except ValueError:
+        raise SearchError(f"Invalid {name}")
+
+
+def create_search_routes(db):
+    search_bp = Blueprint("search", __name__)
+    collections = [name for category in CATEGORIES.values()
+                   for name in (category.collection, category.detail_collection)]
+
+    # Route: Search names and descriptions across every category, with price and category facets
+    @search_bp.route("/search", methods=["GET"])
+    @conditional(CollectionVersions(db), *collections)
+    def search():
+        try:
+            limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+            offset = request.args.get("offset", 0, type=int)
+            if not 1 <= limit <= MAX_PAGE_SIZE or offset < 0:
+                raise SearchError(f"limit must be 1-{MAX_PAGE_SIZE} and offset non-negative")
+            result = get_search_index().search(
+                q=request.args.get("q", ""),
+                category=request.args.get("category") or None,
+                min_price=_price_arg("min_price"),
+                max_price=_price_arg("max_price"),
+                sort=request.args.get("sort", "relevance"),
+                limit=limit,
+                offset=offset,
+            )
+        except SearchError as e:
+            return jsonify({"message": str(e)}), 400
+        except Exception as e:
+            return jsonify({"message": f"Error searching: {str(e)}"}), 500
+        return jsonify({**result, "results": present_all(result["results"])}), 200
+
+    return search_bp
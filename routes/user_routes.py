@@ -1,11 +1,11 @@
 from flask import Blueprint, request, jsonify
 import re
 from models.user_model import UserModel
+from utils.passwords import HasherBusy
 
-# Blueprint setup
-auth_bp = Blueprint("auth", __name__)
-
+# Blueprint factory; a fresh blueprint per app so create_app() can run more than once
 def create_auth_routes(db):
+    auth_bp = Blueprint("auth", __name__)
     user_model = UserModel(db)
 
     @auth_bp.route("/user-signup", methods=["POST"])
@@ -17,9 +17,6 @@ def create_auth_routes(db):
         if not data:
             return jsonify({"error": "Invalid JSON format"}), 400
 
-        # Log received data
-        print(f"Received data: {data}")
-
         # Extract data from request
         name = data.get("name")
         email = data.get("email")
@@ -41,7 +38,10 @@ def create_auth_routes(db):
             return jsonify({"error": "Email already registered"}), 400
 
         # Create new user
-        user_model.create_user(name, email, password)
+        try:
+            user_model.create_user(name, email, password)
+        except HasherBusy:
+            return jsonify({"error": "Too many requests, please retry"}), 429, {"Retry-After": "1"}
         return jsonify({"message": "User registered successfully"}), 201
 
     return auth_bp
@@ -0,0 +1,48 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+mongomock = pytest.importorskip("mongomock")
+
+from config import Config  # noqa: E402
+
+# Smallest upload the image sniffer accepts as a JPEG
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().soundbox
+
+
+@pytest.fixture
+def app(db, tmp_path, monkeypatch):
+    """create_app over an in-memory database, with uploads under tmp_path."""
+    import flask_pymongo
+    from app import create_app
+
+    class InMemoryMongo:
+        def __init__(self, app=None, *args, **kwargs):
+            self.db = db
+            self.cx = db.client
+
+    monkeypatch.setattr(flask_pymongo, "PyMongo", InMemoryMongo)
+
+    class TestConfig(Config):
+        TESTING = True
+        ADMIN_WRITE_AUTH = False
+        METRICS_ENABLED = False
+        THUMBNAILS_ENABLED = False
+        ENSURE_INDEXES_ON_STARTUP = False
+        UPLOAD_FOLDER = str(tmp_path / "uploads")
+        PUBLIC_BASE_URL = ""
+        LOG_LEVEL = "CRITICAL"
+
+    return create_app(TestConfig)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
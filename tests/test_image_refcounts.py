@@ -0,0 +1,76 @@
+import io
+import os
+import pytest
+from conftest import JPEG
+
+
+def upload(content):
+    return (io.BytesIO(content), "image.jpg")
+
+
+def refcounts(db):
+    return {blob["_id"]: blob["refcount"] for blob in db.image_blobs.find()}
+
+
+def image_key(response):
+    return response.json["image_url"].split("/uploads/", 1)[1]
+
+
+@pytest.fixture
+def upload_root(app):
+    return app.config["UPLOAD_FOLDER"]
+
+
+def test_create_counts_one_reference_per_item(client, db, upload_root):
+    first = client.post("/earphones", data={"name": "a", "price": "1", "image": upload(JPEG)})
+    second = client.post("/earphones", data={"name": "b", "price": "2", "image": upload(JPEG)})
+    assert first.status_code == second.status_code == 201
+
+    key = image_key(first)
+    assert image_key(second) == key
+    assert refcounts(db) == {key: 2}
+    assert os.path.exists(os.path.join(upload_root, *key.split("/")))
+
+
+def test_update_moves_the_reference_to_the_new_image(client, db, upload_root):
+    created = client.post("/earphones", data={"name": "a", "price": "1", "image": upload(JPEG)})
+    old_key = image_key(created)
+
+    updated = client.put(f"/earphones/{created.json['_id']}", data={"image": upload(JPEG + b"new")})
+    assert updated.status_code == 200
+    new_key = image_key(updated)
+    assert refcounts(db) == {new_key: 1}
+    assert not os.path.exists(os.path.join(upload_root, *old_key.split("/")))
+
+
+def test_rejected_update_keeps_the_old_reference(client, db):
+    created = client.post("/earphones", data={"name": "a", "price": "1", "image": upload(JPEG)})
+
+    response = client.put(f"/earphones/{created.json['_id']}", data={"price": "abc", "image": upload(JPEG + b"new")})
+    assert response.status_code == 400
+    assert refcounts(db) == {image_key(created): 1}
+
+
+def test_delete_releases_the_reference(client, db, upload_root):
+    first = client.post("/earphones", data={"name": "a", "price": "1", "image": upload(JPEG)})
+    second = client.post("/earphones", data={"name": "b", "price": "2", "image": upload(JPEG)})
+    key = image_key(first)
+    path = os.path.join(upload_root, *key.split("/"))
+
+    assert client.delete(f"/earphones/{first.json['_id']}").status_code == 200
+    assert refcounts(db) == {key: 1}
+    assert os.path.exists(path)
+
+    assert client.delete(f"/earphones/{second.json['_id']}").status_code == 200
+    assert refcounts(db) == {}
+    assert not os.path.exists(path)
+
+
+def test_failed_rename_counts_no_reference(client, db, monkeypatch):
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", broken_replace)
+    response = client.post("/earphones", data={"name": "a", "price": "1", "image": upload(JPEG)})
+    assert response.status_code == 500
+    assert refcounts(db) == {}
@@ -0,0 +1,74 @@
+import base64
+import json
+import pytest
+from bson import ObjectId
+from utils.pagination import PaginationError, decode_cursor, encode_cursor, keyset_filter
+
+
+def raw_cursor(sort, keys):
+    return base64.urlsafe_b64encode(json.dumps({"s": sort, "k": keys}).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("sort, doc", [
+    ("_id", {}),
+    ("-_id", {}),
+    ("recent", {}),
+    ("price", {"price": 4999.5}),
+    ("-price", {"price": 10}),
+    ("price_minor", {"price_minor": 499950}),
+    ("-price_minor", {"price_minor": 0}),
+])
+def test_cursor_round_trip(sort, doc):
+    doc = {**doc, "_id": ObjectId()}
+    keys = decode_cursor(encode_cursor(doc, sort), sort)
+    assert keys[-1] == doc["_id"]
+    assert keys[:-1] == [value for field, value in doc.items() if field != "_id"]
+
+
+@pytest.mark.parametrize("sort, token", [
+    ("price", "not base64!"),
+    ("price", base64.urlsafe_b64encode(b"not json").decode()),
+    ("price", raw_cursor("price", [10])),
+    ("price", raw_cursor("price", [10, "not an object id"])),
+    ("price", raw_cursor("price", [{"$ne": None}, str(ObjectId())])),
+    ("price", raw_cursor("price", [True, str(ObjectId())])),
+    ("price", raw_cursor("price", ["10", str(ObjectId())])),
+    ("price_minor", raw_cursor("price_minor", [10.5, str(ObjectId())])),
+    ("price_minor", raw_cursor("price_minor", [[1], str(ObjectId())])),
+], ids=["not-base64", "not-json", "missing-key", "bad-object-id", "operator", "bool", "string", "float", "list"])
+def test_decode_cursor_rejects_bad_cursors(sort, token):
+    with pytest.raises(PaginationError):
+        decode_cursor(token, sort)
+
+
+def test_decode_cursor_rejects_other_sort():
+    token = encode_cursor({"_id": ObjectId(), "price": 1}, "price")
+    with pytest.raises(PaginationError, match="does not match"):
+        decode_cursor(token, "-price")
+
+
+def test_keyset_filter_continues_after_cursor():
+    oid = ObjectId()
+    assert keyset_filter("_id", [oid]) == {"_id": {"$gt": oid}}
+    assert keyset_filter("-price", [10, oid]) == {"$or": [
+        {"price": {"$lt": 10}},
+        {"price": 10, "_id": {"$lt": oid}},
+    ]}
+
+
+def test_pages_cover_every_item_once(client, db):
+    db.earphones.insert_many([{"name": f"e{i}", "price": i % 4, "image_url": None} for i in range(11)])
+    seen, url = [], "/earphones?limit=3&sort=-price"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        seen.extend(response.json)
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/earphones?limit=3&sort=-price&after={cursor}" if cursor else None
+    assert sorted(item["name"] for item in seen) == sorted(f"e{i}" for i in range(11))
+    assert [item["price"] for item in seen] == sorted((i % 4 for i in range(11)), reverse=True)
+
+
+def test_bad_cursor_is_a_400(client):
+    response = client.get("/earphones?sort=price&after=" + raw_cursor("price", [{"$ne": None}, str(ObjectId())]))
+    assert response.status_code == 400
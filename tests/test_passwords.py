@@ -0,0 +1,24 @@
+import pytest
+from werkzeug.security import generate_password_hash
+from utils.passwords import PasswordHasher
+
+
+@pytest.mark.parametrize("method", ["pbkdf2", "pbkdf2:sha256", "pbkdf2:sha256:1000000", "scrypt", "scrypt:32768:8:1"])
+def test_hash_made_with_the_configured_method_is_current(method):
+    stored = generate_password_hash("secret", method, 16)
+    assert not PasswordHasher(method=method).needs_rehash(stored)
+
+
+@pytest.mark.parametrize("stored_method, method", [
+    ("pbkdf2:sha256:600000", "pbkdf2"),
+    ("pbkdf2", "scrypt"),
+    ("scrypt:16384:8:1", "scrypt:32768:8:1"),
+])
+def test_hash_made_with_other_parameters_needs_rehash(stored_method, method):
+    stored = generate_password_hash("secret", stored_method, 16)
+    assert PasswordHasher(method=method).needs_rehash(stored)
+
+
+def test_prefix_expands_short_method_names():
+    assert PasswordHasher(method="pbkdf2").prefix.startswith("pbkdf2:sha256:")
+    assert PasswordHasher(method="scrypt").prefix == "scrypt:32768:8:1"
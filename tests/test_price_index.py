@@ -0,0 +1,78 @@
+import base64
+import json
+import pytest
+from bson import ObjectId
+from models.price_index import price_to_minor
+
+PRICES = [5, 10, 10, 10, 25.5, 40, 40, 99.99, 120, 500]
+
+
+@pytest.fixture
+def items(db):
+    docs = [{"name": f"e{i}", "price": price, "price_minor": price_to_minor(price), "image_url": None}
+            for i, price in enumerate(PRICES)]
+    db.earphones.insert_many(docs)
+    return docs
+
+
+def walk(client, query):
+    """Every item of a paginated price range, following X-Next-Cursor to the end."""
+    seen, after = [], None
+    while True:
+        response = client.get(f"/earphones?{query}" + (f"&after={after}" if after else ""))
+        assert response.status_code == 200
+        seen.extend(response.json)
+        after = response.headers.get("X-Next-Cursor")
+        if not after:
+            return seen
+
+
+def test_price_to_minor():
+    assert price_to_minor("4,999.50") == 499950
+    assert price_to_minor(99.99) == 9999
+    for bad in ("nan", "inf", "1e400"):
+        with pytest.raises(ValueError):
+            price_to_minor(bad)
+
+
+@pytest.mark.usefixtures("items")
+@pytest.mark.parametrize("limit", [1, 2, 3, 100])
+def test_range_pages_ascending(client, limit):
+    seen = walk(client, f"price_min=10&price_max=99.99&limit={limit}")
+    assert [item["price"] for item in seen] == [10, 10, 10, 25.5, 40, 40, 99.99]
+    assert len({item["_id"] for item in seen}) == len(seen)
+
+
+@pytest.mark.usefixtures("items")
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_range_pages_descending(client, limit):
+    seen = walk(client, f"price_min=10&order=-price&limit={limit}")
+    assert [item["price"] for item in seen] == [500, 120, 99.99, 40, 40, 25.5, 10, 10, 10]
+    assert len({item["_id"] for item in seen}) == len(seen)
+
+
+def test_index_follows_writes(client, db, items):
+    assert [item["price"] for item in walk(client, "price_max=5")] == [5]
+    db.earphones.update_one({"_id": items[-1]["_id"]}, {"$set": {"price": 1, "price_minor": 100}})
+    db.collection_versions.update_one({"_id": "earphones"}, {"$inc": {"version": 1}}, upsert=True)
+    assert [item["price"] for item in walk(client, "price_max=5")] == [1, 5]
+
+
+@pytest.mark.parametrize("query", [
+    "price_min=abc",
+    "price_min=nan",
+    "price_max=1e400",
+    "order=name",
+    "price_min=1&limit=0",
+])
+def test_invalid_range_arguments_are_a_400(client, query):
+    assert client.get(f"/earphones?{query}").status_code == 400
+
+
+@pytest.mark.parametrize("price_minor", [None, 10.5, "10", {"$gt": 0}])
+def test_cursor_without_integer_price_is_a_400(client, price_minor):
+    raw = json.dumps({"s": "price_minor", "k": [price_minor, str(ObjectId())]}).encode()
+    after = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    response = client.get(f"/earphones?price_min=1&after={after}")
+    assert response.status_code == 400
+    assert response.json == {"message": "Invalid cursor"}
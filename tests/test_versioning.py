@@ -0,0 +1,48 @@
+from pymongo.errors import ServerSelectionTimeoutError
+from utils.versioning import CollectionVersions
+
+
+def test_etag_and_last_modified_answer_304(client, db):
+    db.earphones.insert_one({"name": "a", "price": 1, "image_url": None})
+    CollectionVersions(db).bump("earphones")
+
+    response = client.get("/earphones")
+    assert response.status_code == 200
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+
+    response = client.get("/earphones", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.data == b""
+
+    response = client.get("/earphones", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+
+def test_write_changes_the_etag(client, db):
+    etag = client.get("/earphones").headers["ETag"]
+    CollectionVersions(db).bump("earphone_details")
+
+    response = client.get("/earphones", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_depends_on_the_query(client):
+    assert client.get("/earphones?limit=1").headers["ETag"] != client.get("/earphones?limit=2").headers["ETag"]
+
+
+def test_errors_are_not_given_validators(client):
+    response = client.get("/earphones/000000000000000000000000")
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+def test_unreadable_versions_are_a_json_503(client, monkeypatch):
+    def unavailable(self, names):
+        raise ServerSelectionTimeoutError("no servers")
+
+    monkeypatch.setattr(CollectionVersions, "get_states", unavailable)
+    response = client.get("/earphones")
+    assert response.status_code == 503
+    assert response.json == {"error": "Catalog temporarily unavailable"}
@@ -0,0 +1,131 @@
+import json
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
+
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonlines"}
+OPERATIONS = {"create", "update", "delete"}
+
+
+class BulkRequestError(ValueError):
+    """Raised when a bulk request body cannot be used at all."""
+
+
+def parse_bulk_records(request, max_items):
+    """Read a bulk body as NDJSON (one record per line) or as a JSON array."""
+    if request.mimetype in NDJSON_TYPES:
+        records = []
+        for line_number, line in enumerate(request.stream, start=1):
+            if not line.strip():
+                continue
+            if len(records) >= max_items:
+                raise BulkRequestError(f"Too many records, the limit is {max_items}")
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                raise BulkRequestError(f"Invalid JSON on line {line_number}")
+    else:
+        records = request.get_json(silent=True)
+        if not isinstance(records, list):
+            raise BulkRequestError("Expected a JSON array or NDJSON body")
+        if len(records) > max_items:
+            raise BulkRequestError(f"Too many records, the limit is {max_items}")
+    if not records:
+        raise BulkRequestError("No records to write")
+    return records
+
+
+def _error(index, message):
+    return {"index": index, "status": "error", "error": message}
+
+
+def run_bulk(collection, records, build_document, rejected=None, images=None):
+    """Validate records and apply them with one unordered bulk_write.
+
+    Each record is {"op": "create" | "update" | "delete", "id": ..., <fields>};
+    op defaults to "create". build_document(record, partial) returns the fields
+    to store or raises ValueError. rejected maps record indexes to errors found
+    by the caller. With an ImageStore, a reference is taken on each image_url
+    written and released on each one replaced or deleted. Returns one result
+    per record, in request order.
+    """
+    rejected = rejected or {}
+    results = [None] * len(records)
+    pending = []  # (record index, op name, ObjectId, document)
+
+    for index, record in enumerate(records):
+        if index in rejected:
+            results[index] = _error(index, rejected[index])
+            continue
+        if not isinstance(record, dict):
+            results[index] = _error(index, "Record must be an object")
+            continue
+        op = record.get("op", "create")
+        if op not in OPERATIONS:
+            results[index] = _error(index, f"Unknown op: {op}")
+            continue
+        try:
+            if op == "create":
+                oid = ObjectId()
+            else:
+                oid = ObjectId(record.get("id"))
+            document = build_document(record, partial=(op == "update")) if op != "delete" else None
+        except (InvalidId, TypeError):
+            results[index] = _error(index, "Invalid id")
+            continue
+        except ValueError as e:
+            results[index] = _error(index, str(e))
+            continue
+        pending.append((index, op, oid, document))
+
+    # One query to find which update/delete targets exist, with the image they point at
+    targets = [oid for _, op, oid, _ in pending if op != "create"]
+    existing = {}
+    if targets:
+        existing = {
+            doc["_id"]: doc.get("image_url")
+            for doc in collection.find({"_id": {"$in": targets}}, {"image_url": 1})
+        }
+
+    ops = []
+    op_records = []  # (record index, image_url added, image_url removed)
+    for index, op, oid, document in pending:
+        if op == "create":
+            ops.append(InsertOne({"_id": oid, **document}))
+        elif oid not in existing:
+            results[index] = _error(index, "Not found")
+            continue
+        elif op == "update":
+            ops.append(UpdateOne({"_id": oid}, {"$set": document}))
+        else:
+            ops.append(DeleteOne({"_id": oid}))
+        added = document.get("image_url") if document else None
+        removed = existing.get(oid) if op == "delete" or added else None
+        op_records.append((index, added, removed))
+        results[index] = {"index": index, "status": f"{op}d", "id": str(oid)}
+
+    if ops:
+        try:
+            collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                index = op_records[write_error["index"]][0]
+                results[index] = _error(index, write_error.get("errmsg", "Write failed"))
+    if images:
+        written = [(added, removed) for index, added, removed in op_records if results[index]["status"] != "error"]
+        # Take the new references first, so a blob moved between documents is never deleted
+        for added, removed in written:
+            if added != removed:
+                images.retain(added)
+        for added, removed in written:
+            if added != removed:
+                images.release(removed)
+    return results
+
+
+def summarize(results):
+    summary = {"created": 0, "updated": 0, "deleted": 0, "error": 0}
+    for result in results:
+        summary[result["status"]] += 1
+    return {**summary, "results": results}
@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import get_registry
+
+DEFAULT_TTL_SECONDS = 60
+DEFAULT_MAX_ENTRIES = 1024
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a fixed TTL.
+
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, name, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, enabled=True):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        if not self.enabled:
+            return default
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Store value; ttl overrides the cache-wide TTL for this entry when shorter."""
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss.
+
+        None results are not cached so lookups of missing documents stay cheap
+        to invalidate.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    async def get_or_load_async(self, key, loader):
+        """get_or_load for the async read path; loader() returns an awaitable."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = await loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one key, or the whole cache when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# Process-wide registry, one cache per collection
+_caches = {}
+_settings = {
+    "ttl": DEFAULT_TTL_SECONDS,
+    "max_entries": DEFAULT_MAX_ENTRIES,
+    "disabled": set(),
+}
+_registry_lock = threading.Lock()
+
+
+def configure_caches(config):
+    """Apply CACHE_* settings from the Flask config to current and future caches."""
+    _settings["ttl"] = config.get("CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+    _settings["max_entries"] = config.get("CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+    _settings["disabled"] = set(config.get("CACHE_DISABLED_COLLECTIONS", ()))
+    with _registry_lock:
+        for name, cache in _caches.items():
+            cache.ttl = _settings["ttl"]
+            cache.max_entries = _settings["max_entries"]
+            cache.enabled = name not in _settings["disabled"]
+            cache.invalidate()
+
+
+def get_cache(name):
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = TTLCache(
+                name,
+                max_entries=_settings["max_entries"],
+                ttl=_settings["ttl"],
+                enabled=name not in _settings["disabled"],
+            )
+            _caches[name] = cache
+        return cache
+
+
+def cache_stats():
+    with _registry_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def _cache_metrics():
+    """Read cache counters for /metrics."""
+    stats = cache_stats()
+    for name, help in (("hits", "Cache hits."), ("misses", "Cache misses."), ("evictions", "LRU evictions.")):
+        yield (f"cache_{name}_total", "counter", help,
+               [({"cache": cache}, s[name]) for cache, s in stats.items()])
+    yield ("cache_hit_ratio", "gauge", "Hits over lookups since start.",
+           [({"cache": cache}, s["hit_ratio"]) for cache, s in stats.items()])
+    yield ("cache_entries", "gauge", "Entries currently cached.",
+           [({"cache": cache}, s["size"]) for cache, s in stats.items()])
+
+
+get_registry().register_collector(_cache_metrics)
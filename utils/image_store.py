@@ -0,0 +1,225 @@
+import datetime
+import hashlib
+import os
+import re
+import tempfile
+from collections import Counter
+from itertools import chain
+from urllib.parse import urlparse
+from flask import request, jsonify, current_app
+from pymongo import ReturnDocument, UpdateMany, UpdateOne
+from werkzeug.exceptions import RequestEntityTooLarge
+from utils.thumbnails import get_thumbnails
+
+CHUNK_SIZE = 1 << 16
+SNIFF_BYTES = 16
+# Leading bytes of every accepted image type and the extension it is stored under
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+)
+# Allowance for the text fields sent next to the image in the same multipart body
+FORM_OVERHEAD_BYTES = 64 * 1024
+BLOB_NAME = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+# Content-addressed files never change, so clients may keep them forever
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+class ImageRejected(ValueError):
+    """Raised when an upload is not an accepted image or is over the size limit."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def sniff_image_type(head):
+    """Extension for the image type the first bytes belong to, or None."""
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def max_image_bytes(category):
+    return category.max_image_bytes or current_app.config["MAX_IMAGE_BYTES"]
+
+
+def upload_size_guard(category):
+    """before_request hook: answer 413 for multipart writes over the category's image limit.
+
+    The body is parsed here under a per-request max_content_length, so a large
+    Content-Length is refused before anything is read and a chunked body is cut
+    off as soon as it crosses the limit. File parts are spooled to disk by
+    werkzeug, not held in memory.
+    """
+    def guard():
+        if request.method not in ("POST", "PUT") or request.mimetype != "multipart/form-data":
+            return None
+        limit = max_image_bytes(category)
+        request.max_content_length = limit + FORM_OVERHEAD_BYTES
+        try:
+            request.files
+        except RequestEntityTooLarge:
+            return jsonify({"message": f"Image too large, the limit is {limit} bytes"}), 413
+        return None
+    return guard
+
+
+def is_blob_name(filename):
+    return bool(BLOB_NAME.match(filename))
+
+
+def blob_key_from_url(image_url):
+    """Return "<folder>/<sha256>.<ext>" for a content-addressed image URL, else None."""
+    if not image_url:
+        return None
+    parts = urlparse(image_url).path.rstrip("/").split("/")
+    if len(parts) < 2 or not is_blob_name(parts[-1]):
+        return None
+    return f"{parts[-2]}/{parts[-1]}"
+
+
+class ImageStore:
+    """Stores uploads under the SHA-256 of their content with refcounts in MongoDB.
+
+    Identical uploads share one file, and different files can never overwrite
+    each other. Each catalog or detail document that points at a blob holds one
+    reference. The file is deleted when the last reference is released.
+    """
+
+    def __init__(self, db, upload_root):
+        self.blobs = db["image_blobs"]
+        self.upload_root = upload_root
+
+    def save(self, image, folder, max_bytes=None):
+        """Stream an uploaded FileStorage to disk while hashing it; return the stored filename.
+
+        The type comes from the file's leading bytes, not its name. Raises
+        ImageRejected (400 or 413) for other content or more than max_bytes.
+        """
+        head = image.stream.read(SNIFF_BYTES)
+        ext = sniff_image_type(head)
+        if ext is None:
+            raise ImageRejected("Invalid image file type")
+
+        target_dir = os.path.join(self.upload_root, folder)
+        os.makedirs(target_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=target_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in chain([head], iter(lambda: image.stream.read(CHUNK_SIZE), b"")):
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise ImageRejected(f"Image too large, the limit is {max_bytes} bytes", 413)
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            filename = f"{digest.hexdigest()}.{ext}"
+            # Same name means same bytes, so replacing an existing blob is harmless.
+            # The file goes first: a failed rename must not leave a reference counted
+            os.replace(tmp_path, os.path.join(target_dir, filename))
+            self.blobs.update_one(
+                {"_id": f"{folder}/{filename}"},
+                {
+                    "$inc": {"refcount": 1},
+                    "$setOnInsert": {"size": size, "created_at": datetime.datetime.utcnow()},
+                },
+                upsert=True,
+            )
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return filename
+
+    def retain(self, image_url):
+        """Add one reference to the blob behind image_url, for documents written without an upload."""
+        key = blob_key_from_url(image_url)
+        if key:
+            self.blobs.update_one({"_id": key}, {"$inc": {"refcount": 1}})
+
+    def recount(self, collections):
+        """Set every blob's refcount to the number of documents in collections pointing at it.
+
+        For writes that bypass save() and release(), such as snapshot imports.
+        A referenced file already on disk without a record gets one; blobs
+        nothing references drop to zero and are left to collect_garbage.
+        """
+        counts = Counter()
+        for collection in collections:
+            for doc in collection.find({"image_url": {"$type": "string"}}, {"image_url": 1}):
+                key = blob_key_from_url(doc["image_url"])
+                if key:
+                    counts[key] += 1
+
+        ops = [UpdateMany({"_id": {"$nin": list(counts)}}, {"$set": {"refcount": 0}})]
+        for key, count in counts.items():
+            path = os.path.join(self.upload_root, *key.split("/"))
+            on_disk = os.path.exists(path)
+            ops.append(UpdateOne(
+                {"_id": key},
+                {
+                    "$set": {"refcount": count},
+                    "$setOnInsert": {
+                        "size": os.path.getsize(path) if on_disk else 0,
+                        "created_at": datetime.datetime.utcnow(),
+                    },
+                },
+                upsert=on_disk,
+            ))
+        self.blobs.bulk_write(ops, ordered=False)
+
+    def release(self, image_url):
+        """Drop one reference to the blob behind image_url and delete it when none are left."""
+        key = blob_key_from_url(image_url)
+        if not key:
+            return
+        blob = self.blobs.find_one_and_update(
+            {"_id": key}, {"$inc": {"refcount": -1}}, return_document=ReturnDocument.AFTER
+        )
+        if blob and blob["refcount"] <= 0:
+            if self.blobs.delete_one({"_id": key, "refcount": {"$lte": 0}}).deleted_count:
+                self._remove_file(key)
+
+    def collect_garbage(self):
+        """Delete blob files that no document references any more. Returns the removed keys."""
+        removed = []
+        for blob in self.blobs.find({"refcount": {"$lte": 0}}, {"_id": 1}):
+            if self.blobs.delete_one({"_id": blob["_id"], "refcount": {"$lte": 0}}).deleted_count:
+                self._remove_file(blob["_id"])
+                removed.append(blob["_id"])
+        for folder in os.listdir(self.upload_root):
+            folder_path = os.path.join(self.upload_root, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            names = [name for name in os.listdir(folder_path) if is_blob_name(name)]
+            known = {
+                blob["_id"] for blob in
+                self.blobs.find({"_id": {"$in": [f"{folder}/{name}" for name in names]}}, {"_id": 1})
+            }
+            for name in names:
+                key = f"{folder}/{name}"
+                if key not in known:
+                    self._remove_file(key)
+                    removed.append(key)
+        return removed
+
+    def _remove_file(self, key):
+        folder, filename = key.split("/")
+        try:
+            os.remove(os.path.join(self.upload_root, folder, filename))
+        except FileNotFoundError:
+            pass
+        get_thumbnails().remove_variants(folder, filename)
+
+
+def set_immutable(response):
+    """Long-lived caching headers for a content-addressed file response."""
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,60 @@
+from urllib.parse import urlparse
+from flask import request, has_request_context
+from utils.thumbnails import get_thumbnails
+from utils.services import get_service, set_service
+
+UPLOADS_PREFIX = "uploads/"
+
+
+def configure_image_urls(app):
+    """Use PUBLIC_BASE_URL (e.g. a CDN origin) for image links; unset means the request's host."""
+    set_service(app, "base_url", (app.config.get("PUBLIC_BASE_URL") or "").rstrip("/") or None)
+
+
+def image_key(value):
+    """Host-independent "<folder>/<filename>" key for a stored image reference.
+
+    Documents store keys, but legacy absolute URLs such as
+    http://192.168.29.32:5000/uploads/earphones/Earphone1.jpg are accepted too.
+    """
+    if not value:
+        return value
+    path = urlparse(value).path.lstrip("/")
+    if path.startswith(UPLOADS_PREFIX):
+        path = path[len(UPLOADS_PREFIX):]
+    return path
+
+
+def current_base_url():
+    """Origin image links are built on: PUBLIC_BASE_URL, else the current request's host."""
+    base_url = get_service("base_url")
+    if base_url:
+        return base_url
+    if has_request_context():
+        return request.host_url.rstrip("/")
+    return ""
+
+
+def public_url(key, base_url=None):
+    """base_url stands in for the request's host outside a Flask request (the async app)."""
+    if base_url and not get_service("base_url"):
+        base = base_url.rstrip("/")
+    else:
+        base = current_base_url()
+    return f"{base}/{UPLOADS_PREFIX}{key}"
+
+
+def present(item, base_url=None):
+    """Copy of a serialized catalog item with image_url resolved and its srcset map added."""
+    if not item or not item.get("image_url"):
+        return item
+    url = public_url(image_key(item["image_url"]), base_url)
+    presented = {**item, "image_url": url}
+    srcset = get_thumbnails().srcset(url)
+    if srcset:
+        presented["srcset"] = srcset
+    return presented
+
+
+def present_all(items, base_url=None):
+    return [present(item, base_url) for item in items]
@@ -0,0 +1,109 @@
+import dataclasses
+import datetime
+import decimal
+import importlib.util
+import json
+import uuid
+from bson import ObjectId
+from flask import current_app
+from flask.json.provider import JSONProvider
+from utils.cache import get_cache
+from utils.image_urls import current_base_url, present
+
+# orjson is optional; without it responses go through the stdlib encoder
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+if HAS_ORJSON:
+    import orjson
+
+
+def default(o):
+    """Types neither encoder handles natively. Datetimes become RFC 3339 on both paths."""
+    if isinstance(o, (ObjectId, decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if isinstance(o, datetime.date):
+        return o.isoformat()
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def encode(obj):
+    """Compact JSON bytes. orjson writes datetimes as RFC 3339 and ObjectIds as hex strings."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider on orjson, so jsonify() and request.get_json() use it.
+
+    Keys keep the insertion order the models build them in. In debug mode,
+    or with compact = False, responses are indented by the stdlib encoder.
+    """
+
+    compact = None
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault("default", default)
+            return json.dumps(obj, **kwargs)
+        return encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        obj = kwargs or (args[0] if len(args) == 1 else list(args) or None)
+        app = current_app
+        if (self.compact is None and app.debug) or self.compact is False:
+            body = self.dumps(obj, indent=2, ensure_ascii=False) + "\n"
+        else:
+            # Straight to bytes, without a str round-trip
+            body = encode(obj)
+        return app.response_class(body, mimetype=self.mimetype)
+
+
+def configure_json(app):
+    if HAS_ORJSON:
+        app.json = OrjsonProvider(app)
+
+
+class FragmentCache:
+    """Encoded JSON of single presented documents, next to a model's read cache.
+
+    List responses are assembled by joining cached fragments, so an item is
+    encoded once per collection version instead of once per response. Keys
+    include the collection version, which changes on every write in any
+    worker, plus the image URL base and the document's field names, since
+    both change the bytes.
+    """
+
+    def __init__(self, collection, versions):
+        self.collection = collection
+        self.cache = get_cache(f"{collection}.json")
+        self.versions = versions
+
+    def invalidate(self):
+        self.cache.invalidate()
+
+    def fragment(self, item, version, base_url):
+        key = (version, base_url, item["_id"], tuple(item))
+        fragment = self.cache.get(key)
+        if fragment is None:
+            fragment = encode(present(item, base_url))
+            self.cache.set(key, fragment)
+        return fragment
+
+    def response(self, items):
+        """JSON array response of the presented items, built from cached fragments."""
+        version, _ = self.versions.get(self.collection)
+        base_url = current_base_url()
+        body = b"[" + b",".join(self.fragment(item, version, base_url) for item in items) + b"]"
+        return current_app.response_class(body, mimetype="application/json")
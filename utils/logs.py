@@ -0,0 +1,103 @@
+import json
+import logging
+import random
+import sys
+import time
+
+# LogRecord attributes that are not structured fields passed through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and every extra= field."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRS:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """Keep a fraction of records below WARNING; warnings and errors always pass.
+
+    A record can force itself through with extra={"sampled": True}, e.g. a
+    slow request that should be seen regardless of the rate.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or getattr(record, "sampled", False):
+            return True
+        return random.random() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """Let the same (logger, message) through at most once per interval, counting the rest.
+
+    Model errors repeat once per request while MongoDB is down; the first one
+    of each interval is logged with "suppressed" set to how many were dropped.
+    """
+
+    def __init__(self, interval):
+        super().__init__()
+        self.interval = interval
+        self._seen = {}
+
+    def filter(self, record):
+        if self.interval <= 0:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        last, suppressed = self._seen.get(key, (0.0, 0))
+        if now - last < self.interval:
+            self._seen[key] = (last, suppressed + 1)
+            return False
+        self._seen[key] = (now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+ACCESS_LOGGER = "soundbox.access"
+
+
+def configure_logging(config):
+    """Set up the "soundbox" loggers from LOG_* settings: JSON or text lines on stderr.
+
+    Access logs (soundbox.access) are sampled at LOG_SAMPLE_RATE; every other
+    soundbox logger is rate limited per message to one per LOG_RATE_LIMIT_SECONDS.
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    if config.get("LOG_FORMAT", "json") == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+
+    root = logging.getLogger("soundbox")
+    root.handlers[:] = [handler]
+    root.setLevel(config.get("LOG_LEVEL", "INFO"))
+    root.propagate = False
+    handler.filters[:] = [RateLimitFilter(config.get("LOG_RATE_LIMIT_SECONDS", 10))]
+
+    access = logging.getLogger(ACCESS_LOGGER)
+    access.handlers[:] = [logging.StreamHandler(sys.stderr)]
+    access.handlers[0].setFormatter(handler.formatter)
+    access.filters[:] = [SampleFilter(config.get("LOG_SAMPLE_RATE", 0.01))]
+    access.propagate = False
+
+
+def get_logger(name):
+    """Logger under the "soundbox" namespace, e.g. get_logger("models.catalog")."""
+    return logging.getLogger(f"soundbox.{name}")
@@ -0,0 +1,142 @@
+import datetime
+import mimetypes
+import os
+from flask import request, send_file, make_response
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+from utils.cache import get_cache
+from utils.image_store import set_immutable
+from utils.services import get_service, set_service
+
+DEFAULT_MAX_AGE = 24 * 3600
+DEFAULT_STAT_TTL = 5
+# Precompressed siblings, in order of preference: <file>.br, <file>.gz
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class FileMeta:
+    __slots__ = ("path", "size", "mtime", "etag", "mimetype")
+
+    def __init__(self, path, stat):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        # Same inputs werkzeug uses, but computed once per stat-cache entry
+        self.etag = f"{int(stat.st_mtime)}-{stat.st_size}-{stat.st_ino}"
+        self.mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    @property
+    def last_modified(self):
+        return datetime.datetime.fromtimestamp(int(self.mtime), tz=datetime.timezone.utc)
+
+
+class MediaServer:
+    """Serves files from the upload folders with as little Python work per request as possible.
+
+    - file metadata (size, mtime, ETag, type), or the file's absence, is cached
+      for stat_ttl seconds, so a revalidation with If-None-Match /
+      If-Modified-Since answers 304 without touching the disk
+    - byte ranges are handled by werkzeug's conditional send_file
+    - <file>.br / <file>.gz siblings are sent when the client accepts them
+    - with offload set, the body is left to the front proxy: "x-sendfile"
+      (Apache/lighttpd) or "x-accel" (nginx internal location at accel_prefix)
+    """
+
+    def __init__(self, media_root, max_age=DEFAULT_MAX_AGE, stat_ttl=DEFAULT_STAT_TTL,
+                 offload=None, accel_prefix="/protected-uploads/"):
+        self.media_root = os.path.abspath(media_root)
+        self.max_age = max_age
+        self.stat_ttl = stat_ttl
+        self.offload = offload or None
+        self.accel_prefix = accel_prefix.rstrip("/") + "/"
+        self.stat_cache = get_cache("media_stat")
+
+    def _meta(self, path):
+        meta = self.stat_cache.get(path)
+        if meta is None:
+            meta = self._stat(path)
+            # Misses are cached as False, so probing for .br/.gz siblings that
+            # do not exist stays off the disk too
+            self.stat_cache.set(path, meta or False, ttl=self.stat_ttl)
+        return meta or None
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        return FileMeta(path, stat)
+
+    def _pick_encoding(self, meta):
+        accepted = request.headers.get("Accept-Encoding", "")
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding in accepted:
+                compressed = self._meta(meta.path + suffix)
+                if compressed is not None:
+                    return encoding, compressed
+        return None, meta
+
+    def send(self, directory, filename, immutable=False):
+        path = safe_join(directory, filename)
+        meta = self._meta(path) if path else None
+        if meta is None:
+            raise NotFound()
+
+        encoding, body = self._pick_encoding(meta)
+        etag = body.etag + (f"-{encoding}" if encoding else "")
+
+        if self._not_modified(etag, body):
+            response = make_response("", 304)
+            response.set_etag(etag)
+        elif self.offload == "x-accel":
+            response = make_response("", 200)
+            relative = os.path.relpath(body.path, self.media_root).replace(os.sep, "/")
+            response.headers["X-Accel-Redirect"] = self.accel_prefix + relative
+            response.mimetype = meta.mimetype
+            response.set_etag(etag)
+            response.last_modified = body.last_modified
+        else:
+            # Honors Range / If-Range and app.use_x_sendfile (USE_X_SENDFILE)
+            response = send_file(
+                body.path, mimetype=meta.mimetype, conditional=True,
+                etag=etag, last_modified=body.mtime,
+            )
+
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.headers.setdefault("Accept-Ranges", "bytes")
+        if immutable:
+            return set_immutable(response)
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        return response
+
+    @staticmethod
+    def _not_modified(etag, meta):
+        if request.method not in ("GET", "HEAD") or request.range:
+            return False
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(etag)
+        since = request.if_modified_since
+        return bool(since and meta.last_modified <= since)
+
+
+def configure_media(app, media_root):
+    config = app.config
+    media = MediaServer(
+        media_root,
+        max_age=config.get("MEDIA_MAX_AGE", DEFAULT_MAX_AGE),
+        stat_ttl=config.get("MEDIA_STAT_TTL", DEFAULT_STAT_TTL),
+        offload=config.get("MEDIA_OFFLOAD"),
+        accel_prefix=config.get("MEDIA_ACCEL_PREFIX", "/protected-uploads/"),
+    )
+    return set_service(app, "media", media)
+
+
+def get_media():
+    return get_service("media")
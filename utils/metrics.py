@@ -0,0 +1,222 @@
+import bisect
+import logging
+import os
+import threading
+import time
+
+# Request and MongoDB command latencies, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Response body sizes, in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """One metric family; a child per distinct combination of label values."""
+
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def _key(self, labels):
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def samples(self):
+        """Yield (suffix, label values, extra labels, value) for the text format."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonic count; by convention the name ends in _total."""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            children = list(self._children.items())
+        for key, value in children:
+            yield "", key, (), value
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._children[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                # Per-bucket counts (the last one is +Inf), then sum
+                child = self._children[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            child[0][bisect.bisect_left(self.buckets, value)] += 1
+            child[1] += value
+
+    def samples(self):
+        with self._lock:
+            children = [(key, list(counts), total) for key, (counts, total) in self._children.items()]
+        for key, counts, total in children:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield "_bucket", key, (("le", _number(bound)),), cumulative
+            yield "_sum", key, (), total
+            yield "_count", key, (), cumulative
+
+
+class Registry:
+    """Process-wide metrics rendered in the Prometheus text format.
+
+    Values are per process: under gunicorn every worker keeps its own, and
+    every series carries the worker's pid so they are never merged silently.
+    Collectors are callables run at scrape time that yield
+    (name, type, help, [(labels dict, value)]) for state owned elsewhere,
+    such as cache counters and connection pool gauges.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter, name, help, labels)
+
+    def gauge(self, name, help, labels=()):
+        return self._register(Gauge, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, help, labels, buckets)
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        process = (("pid", os.getpid()),)
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, key, extra, value in metric.samples():
+                labels = _labels(metric.labels, key, (*extra, *process))
+                lines.append(f"{metric.name}{suffix}{labels} {_number(value)}")
+        for collector in collectors:
+            for name, type, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {type}")
+                for labels, value in samples:
+                    if value is not None:
+                        lines.append(f"{name}{_labels(labels, labels.values(), process)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = Registry()
+
+
+def get_registry():
+    return _registry
+
+
+_requests = _registry.counter(
+    "http_requests_total", "Requests served.", ("method", "route", "status"))
+_latency = _registry.histogram(
+    "http_request_duration_seconds", "Time from routing to the end of the response.", ("method", "route"))
+_response_size = _registry.histogram(
+    "http_response_size_bytes", "Response body size, when known up front.", ("method", "route"), SIZE_BUCKETS)
+_in_flight = _registry.gauge(
+    "http_requests_in_flight", "Requests currently being handled by this worker.")
+
+
+def instrument_app(app, slow_request_ms=500):
+    """Record latency, size and status of every request and log a sample of them.
+
+    Routes are labelled by their URL rule ("/earphones/<id>"), never the raw
+    path, so the number of series stays bounded. Requests slower than
+    slow_request_ms are always logged.
+    """
+    from flask import g, request
+    from utils.logs import ACCESS_LOGGER
+    access_log = logging.getLogger(ACCESS_LOGGER)
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+        _in_flight.inc()
+
+    @app.after_request
+    def record_response(response):
+        g.metrics_status = response.status_code
+        # Content-Length is set for buffered bodies and send_file; streamed bodies are skipped
+        size = response.content_length
+        if size is not None:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            _response_size.observe(size, method=request.method, route=route)
+        return response
+
+    @app.teardown_request
+    def finish_timer(error=None):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        _in_flight.dec()
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        status = g.pop("metrics_status", 500)
+        _latency.observe(elapsed, method=request.method, route=route)
+        _requests.inc(method=request.method, route=route, status=status)
+        duration_ms = round(elapsed * 1000, 2)
+        access_log.info("request", extra={
+            "method": request.method, "route": route, "path": request.path, "status": status,
+            "duration_ms": duration_ms, "sampled": duration_ms >= slow_request_ms,
+        })
@@ -0,0 +1,209 @@
+import datetime
+import threading
+from pymongo import monitoring
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from utils.metrics import get_registry
+from utils.services import get_service, set_service
+
+# Smallest maxStalenessSeconds MongoDB accepts
+MIN_MAX_STALENESS_SECONDS = 90
+# The driver estimates secondary lag from heartbeats, so it may be off by one interval (10s)
+STALENESS_MARGIN_SECONDS = 10
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool gauges per server, fed by the driver's CMAP events.
+
+    "waiting" counts threads blocked in connection checkout, the number to
+    watch when requests stall; "checkout_failures" counts checkouts that timed
+    out (waitQueueTimeoutMS) or failed for another reason.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def _pool(self, address):
+        key = "%s:%s" % address
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = {
+                "max_size": None, "open": 0, "in_use": 0, "waiting": 0,
+                "checkouts": 0, "checkout_failures": {}, "checkout_wait_seconds": 0.0,
+            }
+        return pool
+
+    def _update(self, address, **deltas):
+        with self._lock:
+            pool = self._pool(address)
+            for name, delta in deltas.items():
+                pool[name] += delta
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)["max_size"] = event.options.get("maxPoolSize")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop("%s:%s" % event.address, None)
+
+    def connection_created(self, event):
+        self._update(event.address, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._update(event.address, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["waiting"] -= 1
+            failures = pool["checkout_failures"]
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["waiting"] -= 1
+            pool["in_use"] += 1
+            pool["checkouts"] += 1
+            pool["checkout_wait_seconds"] += getattr(event, "duration", None) or 0.0
+
+    def connection_checked_in(self, event):
+        self._update(event.address, in_use=-1)
+
+    def stats(self):
+        with self._lock:
+            pools = {}
+            for address, pool in self._pools.items():
+                max_size = pool["max_size"]
+                pools[address] = {
+                    **pool,
+                    "checkout_failures": dict(pool["checkout_failures"]),
+                    "utilization": round(pool["in_use"] / max_size, 3) if max_size else None,
+                }
+            return pools
+
+
+_command_duration = get_registry().histogram(
+    "mongodb_command_duration_seconds", "MongoDB command round-trip time as seen by the driver.",
+    ("command", "collection", "outcome"))
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Times every MongoDB command, labelled by command name and collection.
+
+    The collection is only in the started event, so it is held per
+    (connection, request id) until the command finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        if not isinstance(collection, str):
+            # e.g. {"ping": 1} or an aggregate over the whole database
+            collection = ""
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event, outcome):
+        with self._lock:
+            collection = self._pending.pop((event.connection_id, event.request_id), "")
+        _command_duration.observe(event.duration_micros / 1e6, command=event.command_name,
+                                  collection=collection, outcome=outcome)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+_monitor = PoolMonitor()
+_commands = CommandMonitor()
+PRIMARY = Primary()
+
+
+def client_options(config):
+    """MongoClient keyword arguments for pool sizing, timeouts, pool and command monitoring."""
+    return {
+        "maxPoolSize": config["MONGO_MAX_POOL_SIZE"],
+        "minPoolSize": config["MONGO_MIN_POOL_SIZE"],
+        "waitQueueTimeoutMS": config["MONGO_WAIT_QUEUE_TIMEOUT_MS"],
+        "connectTimeoutMS": config["MONGO_CONNECT_TIMEOUT_MS"],
+        "socketTimeoutMS": config["MONGO_SOCKET_TIMEOUT_MS"],
+        "serverSelectionTimeoutMS": config["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+        "event_listeners": [_monitor, _commands],
+    }
+
+
+def configure_read_routing(app):
+    """Pick where the app's catalog GETs read from: "primary" or "secondaryPreferred" with bounded staleness."""
+    config = app.config
+    if config.get("CATALOG_READ_PREFERENCE", "primary") == "secondaryPreferred":
+        staleness = max(config.get("MONGO_MAX_STALENESS_SECONDS", MIN_MAX_STALENESS_SECONDS),
+                        MIN_MAX_STALENESS_SECONDS)
+        preference = SecondaryPreferred(max_staleness=staleness)
+    else:
+        preference = Primary()
+    return set_service(app, "read_preference", preference)
+
+
+def catalog_reads(target, updated_at=None):
+    """A Database or Collection with the current app's catalog read preference.
+
+    Only for serving catalog GETs: auth, writes and the reads that keep the
+    search and price indexes in sync stay on the primary. So does a collection
+    last written at updated_at while that write may not have reached every
+    eligible secondary: a secondary may lag by up to max staleness, and
+    whatever a GET loads is cached under the version that write bumped.
+    """
+    preference = get_service("read_preference", PRIMARY)
+    if preference == PRIMARY:
+        return target
+    if updated_at is not None:
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=datetime.timezone.utc)
+        window = datetime.timedelta(seconds=preference.max_staleness + STALENESS_MARGIN_SECONDS)
+        if datetime.datetime.now(datetime.timezone.utc) - updated_at < window:
+            return target
+    return target.with_options(read_preference=preference)
+
+
+def pool_stats():
+    return _monitor.stats()
+
+
+def _pool_metrics():
+    """Connection pool gauges for /metrics, from the same counters as /health."""
+    pools = pool_stats()
+    for name, help in (("open", "Open connections."), ("in_use", "Connections checked out."),
+                       ("waiting", "Threads waiting for a connection."), ("max_size", "maxPoolSize.")):
+        yield (f"mongodb_pool_{name}", "gauge", help,
+               [({"server": address}, pool[name]) for address, pool in pools.items()])
+    yield ("mongodb_pool_checkouts_total", "counter", "Successful connection checkouts.",
+           [({"server": address}, pool["checkouts"]) for address, pool in pools.items()])
+    yield ("mongodb_pool_checkout_wait_seconds_total", "counter", "Time spent waiting in checkout.",
+           [({"server": address}, pool["checkout_wait_seconds"]) for address, pool in pools.items()])
+    yield ("mongodb_pool_checkout_failures_total", "counter", "Failed connection checkouts by reason.",
+           [({"server": address, "reason": reason}, count)
+            for address, pool in pools.items() for reason, count in pool["checkout_failures"].items()])
+
+
+get_registry().register_collector(_pool_metrics)
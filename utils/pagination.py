@@ -0,0 +1,164 @@
+import base64
+import json
+from urllib.parse import urlencode
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Supported sort orders. Every order ends on _id so the keyset is unique.
+SORT_KEYS = {
+    "_id": [("_id", 1)],
+    "-_id": [("_id", -1)],
+    "price": [("price", 1), ("_id", 1)],
+    "-price": [("price", -1), ("_id", -1)],
+    # Integer price in minor units (paise/cents), maintained next to price on write
+    "price_minor": [("price_minor", 1), ("_id", 1)],
+    "-price_minor": [("price_minor", -1), ("_id", -1)],
+    # ObjectIds start with their creation time, so newest first is descending _id
+    "recent": [("_id", -1)],
+}
+
+
+# Types a cursor may carry for each leading sort field; anything else (a dict
+# such as {"$ne": null} in particular) would be spliced into the query as an operator
+KEY_TYPES = {
+    "price": (int, float, type(None)),
+    "price_minor": (int, type(None)),
+}
+
+
+class PaginationError(ValueError):
+    """Raised when the pagination query parameters are invalid."""
+
+
+def _check_key(field, value):
+    if isinstance(value, bool) or not isinstance(value, KEY_TYPES[field]):
+        raise PaginationError("Invalid cursor")
+    return value
+
+
+class PageRequest:
+    def __init__(self, limit, sort, after, fields):
+        self.limit = limit
+        self.sort = sort
+        self.after = after
+        self.fields = fields
+
+    @property
+    def projection(self):
+        return {field: 1 for field in self.fields}
+
+    @property
+    def cache_key(self):
+        after = tuple(self.after) if self.after else None
+        return ("page", self.sort, after, self.limit, tuple(self.fields))
+
+
+def encode_cursor(doc, sort):
+    """Build an opaque cursor pointing just after the given document."""
+    keys = [doc.get(field) if field != "_id" else str(doc["_id"]) for field, _ in SORT_KEYS[sort]]
+    raw = json.dumps({"s": sort, "k": keys}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, sort):
+    """Decode a cursor produced by encode_cursor for the same sort order."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        keys = data["k"]
+        if data["s"] != sort or len(keys) != len(SORT_KEYS[sort]):
+            raise PaginationError("Cursor does not match the requested sort")
+        leading = [_check_key(field, key) for (field, _), key in zip(SORT_KEYS[sort][:-1], keys)]
+        return leading + [ObjectId(keys[-1])]
+    except PaginationError:
+        raise
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise PaginationError("Invalid cursor")
+
+
+def parse_page_args(args, allowed_fields):
+    """Parse limit/after/sort/fields from the request query string."""
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise PaginationError("Invalid limit")
+    if limit < 1:
+        raise PaginationError("Invalid limit")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    sort = args.get("sort", "_id")
+    if sort not in SORT_KEYS:
+        raise PaginationError(f"Invalid sort, expected one of: {', '.join(SORT_KEYS)}")
+
+    fields = list(allowed_fields)
+    if args.get("fields"):
+        fields = [f.strip() for f in args["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in allowed_fields]
+        if unknown:
+            raise PaginationError(f"Unknown fields: {', '.join(unknown)}")
+
+    after = decode_cursor(args["after"], sort) if args.get("after") else None
+    return PageRequest(limit, sort, after, fields)
+
+
+def keyset_filter(sort, after):
+    """Translate a decoded cursor into a range query on the sort keys."""
+    if after is None:
+        return {}
+    (first, direction), *rest = SORT_KEYS[sort]
+    op = "$gt" if direction == 1 else "$lt"
+    if not rest:
+        return {first: {op: after[0]}}
+    second = rest[0][0]
+    return {"$or": [
+        {first: {op: after[0]}},
+        {first: after[0], second: {op: after[1]}},
+    ]}
+
+
+def page_query(page, base_filter=None):
+    """Return the (filter, projection) of one page's find()."""
+    query = dict(base_filter or {})
+    query.update(keyset_filter(page.sort, page.after))
+    projection = page.projection
+    # The sort keys must be present to build the next cursor
+    for field, _ in SORT_KEYS[page.sort]:
+        projection.setdefault(field, 1)
+    return query, projection
+
+
+def split_page(docs, page):
+    """Trim the look-ahead document fetched with limit + 1; return (documents, next_cursor)."""
+    next_cursor = None
+    if len(docs) > page.limit:
+        docs = docs[:page.limit]
+        next_cursor = encode_cursor(docs[-1], page.sort)
+    return docs, next_cursor
+
+
+def fetch_page(collection, page, base_filter=None):
+    """Return (documents, next_cursor) for one page of the collection."""
+    query, projection = page_query(page, base_filter)
+    docs = list(
+        collection.find(query, projection)
+        .sort(SORT_KEYS[page.sort])
+        .limit(page.limit + 1)
+    )
+    return split_page(docs, page)
+
+
+def serialize_page(docs, fields):
+    return [{"_id": str(doc["_id"]), **{f: doc.get(f) for f in fields}} for doc in docs]
+
+
+def set_next_cursor(response, request, next_cursor):
+    """Expose the next page through headers so the body stays a plain list."""
+    if next_cursor:
+        args = request.args.to_dict()
+        args["after"] = next_cursor
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    return response
@@ -0,0 +1,103 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+from utils.services import get_service, set_service
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+DEFAULT_SALT_LENGTH = 16
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing pool already has as much queued work as it accepts."""
+
+
+class PasswordHasher:
+    """Runs password hashing and verification in a process pool.
+
+    At most max_pending jobs may be queued or running; beyond that callers get
+    HasherBusy immediately instead of tying up a request thread. The pool is
+    created lazily in each process, so forked web workers each get their own.
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, salt_length=DEFAULT_SALT_LENGTH,
+                 workers=1, max_pending=64, timeout=10):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+        self._dummy_hash = None
+        self._prefix = None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy("Password hashing queue is full")
+        try:
+            future = self._executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusy("Password hashing timed out")
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, stored_hash, password):
+        return self._run(check_password_hash, stored_hash, password)
+
+    def verify_dummy(self, password):
+        """Spend the same work as a real check, for logins with an unknown email."""
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash(os.urandom(16).hex())
+        self.verify(self._dummy_hash, password)
+        return False
+
+    @property
+    def prefix(self):
+        """The configured method as werkzeug writes it, e.g. "pbkdf2" -> "pbkdf2:sha256:1000000"."""
+        if self._prefix is None:
+            self._prefix = generate_password_hash("", self.method, 1).split("$", 1)[0]
+        return self._prefix
+
+    def needs_rehash(self, stored_hash):
+        """True when a hash was produced with different parameters than the configured ones."""
+        return stored_hash.split("$", 1)[0] != self.prefix
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+def configure_hasher(app):
+    config = app.config
+    hasher = PasswordHasher(
+        method=config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD),
+        salt_length=config.get("PASSWORD_SALT_LENGTH", DEFAULT_SALT_LENGTH),
+        workers=config.get("PASSWORD_HASH_WORKERS", 1),
+        max_pending=config.get("PASSWORD_HASH_MAX_PENDING", 64),
+        timeout=config.get("PASSWORD_HASH_TIMEOUT", 10),
+    )
+    # Expand short method names once, here, instead of on the first login
+    hasher.prefix
+    return set_service(app, "hasher", hasher)
+
+
+def get_hasher():
+    return get_service("hasher")
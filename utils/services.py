@@ -0,0 +1,30 @@
+import sys
+import flask
+
+# Key under app.extensions holding the services create_app builds for that app
+EXTENSION = "soundbox"
+
+
+def set_service(app, name, service):
+    """Attach a service to one app; two apps in a process never share or replace each other's."""
+    app.extensions.setdefault(EXTENSION, {})[name] = service
+    return service
+
+
+def current_app_object():
+    """The Flask or Quart app handling the current request, CLI command or app context, else None."""
+    if flask.has_app_context():
+        return flask.current_app._get_current_object()
+    # Quart keeps its own context; only look when the async app has imported it
+    quart = sys.modules.get("quart")
+    if quart is not None and quart.has_app_context():
+        return quart.current_app._get_current_object()
+    return None
+
+
+def get_service(name, default=None):
+    """A service of the current app, or default outside of one (scripts, benchmarks)."""
+    app = current_app_object()
+    if app is None:
+        return default
+    return app.extensions.get(EXTENSION, {}).get(name, default)
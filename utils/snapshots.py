@@ -0,0 +1,216 @@
+import gzip
+import json
+import os
+import threading
+from bson import json_util
+from pymongo import ReplaceOne
+
+DEFAULT_BATCH_SIZE = 1000
+READ_CHUNK_SIZE = 1 << 16
+SNAPSHOT_PREFIX = "soundbox."
+
+
+class Checkpoint:
+    """Small JSON file recording how far each collection or file has progressed."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def get(self, key):
+        with self._lock:
+            return self.state.get(key)
+
+    def save(self, key, value):
+        with self._lock:
+            self.state[key] = value
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.path)
+
+    def clear(self):
+        with self._lock:
+            self.state = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def snapshot_filename(collection, compress):
+    return f"{SNAPSHOT_PREFIX}{collection}.ndjson" + (".gz" if compress else "")
+
+
+def collection_from_filename(path):
+    """soundbox.earphones.json / .ndjson / .ndjson.gz -> earphones"""
+    name = os.path.basename(path)
+    for suffix in (".gz", ".ndjson", ".json"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    if name.startswith(SNAPSHOT_PREFIX):
+        name = name[len(SNAPSHOT_PREFIX):]
+    return name
+
+
+def export_collection(db, collection, out_dir, compress=False, batch_size=DEFAULT_BATCH_SIZE, checkpoint=None):
+    """Stream one collection to NDJSON in _id order, one batch in memory at a time.
+
+    After every batch the file offset and last _id are checkpointed, so an
+    interrupted export resumes by truncating to the last complete batch and
+    continuing after that _id. Each gzip batch is a separate gzip member, which
+    keeps the truncation point valid for compressed files too.
+    """
+    path = os.path.join(out_dir, snapshot_filename(collection, compress))
+    state = (checkpoint.get(collection) if checkpoint else None) or {"offset": 0, "last_id": None, "count": 0}
+    if state.get("done"):
+        return state["count"]
+
+    # last_id is Extended JSON, so string, integer and ObjectId keys all resume with their own type
+    query = {"_id": {"$gt": json_util.loads(state["last_id"])}} if state["last_id"] else {}
+    cursor = db[collection].find(query).sort("_id", 1).batch_size(batch_size)
+
+    mode = "r+b" if state["offset"] and os.path.exists(path) else "wb"
+    with open(path, mode) as raw:
+        raw.seek(state["offset"])
+        raw.truncate()
+        batch = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                _write_batch(raw, batch, compress, state)
+                if checkpoint:
+                    checkpoint.save(collection, dict(state))
+                batch = []
+        if batch:
+            _write_batch(raw, batch, compress, state)
+
+    state["done"] = True
+    if checkpoint:
+        checkpoint.save(collection, state)
+    return state["count"]
+
+
+def _write_batch(raw, batch, compress, state):
+    data = "".join(
+        json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS) + "\n" for doc in batch
+    ).encode()
+    raw.write(gzip.compress(data) if compress else data)
+    raw.flush()
+    os.fsync(raw.fileno())
+    state["offset"] = raw.tell()
+    state["last_id"] = json_util.dumps(batch[-1]["_id"], json_options=json_util.CANONICAL_JSON_OPTIONS)
+    state["count"] += len(batch)
+
+
+def iter_json_array(fp, decoder, chunk_size=READ_CHUNK_SIZE):
+    """Yield the elements of a top-level JSON array without loading the whole file.
+
+    Only the current element plus one read chunk is held in memory.
+    """
+    buf, eof = "", False
+
+    def more():
+        nonlocal buf, eof
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buf += chunk
+
+    while not buf.lstrip() and not eof:
+        more()
+    buf = buf.lstrip()
+    if not buf.startswith("["):
+        raise ValueError("Expected a JSON array")
+    buf = buf[1:]
+
+    while True:
+        buf = buf.lstrip(" \t\r\n,")
+        if not buf:
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            more()
+            continue
+        if buf[0] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf)
+        except ValueError:
+            # Element cut off by the chunk boundary
+            if eof:
+                raise
+            more()
+            continue
+        yield obj
+        buf = buf[end:]
+
+
+def iter_snapshot(path):
+    """Yield documents from an NDJSON(.gz) snapshot or a legacy Extended JSON array export."""
+    decoder = json.JSONDecoder(object_hook=json_util.object_hook)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fp:
+        first = ""
+        while not first:
+            first = fp.read(1)
+            if not first:
+                return
+            first = first.strip()
+        if first == "[":
+            fp.seek(0)
+            yield from iter_json_array(fp, decoder)
+            return
+        line = first + fp.readline()
+        while line:
+            if line.strip():
+                yield decoder.decode(line)
+            line = fp.readline()
+
+
+def import_snapshot(db, path, collection=None, batch_size=DEFAULT_BATCH_SIZE, checkpoint=None):
+    """Upsert every document of a snapshot file by _id, one batch per round-trip.
+
+    Upserts make re-running a batch harmless, so resuming only needs the
+    number of documents already written.
+    """
+    collection = collection or collection_from_filename(path)
+    key = os.path.abspath(path)
+    state = (checkpoint.get(key) if checkpoint else None) or {"count": 0}
+    if state.get("done"):
+        return collection, state["count"]
+
+    skip = state["count"]
+    batch = []
+    for position, doc in enumerate(iter_snapshot(path)):
+        if position < skip:
+            continue
+        batch.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+        if len(batch) >= batch_size:
+            db[collection].bulk_write(batch, ordered=False)
+            state["count"] += len(batch)
+            if checkpoint:
+                checkpoint.save(key, dict(state))
+            batch = []
+    if batch:
+        db[collection].bulk_write(batch, ordered=False)
+        state["count"] += len(batch)
+
+    state["done"] = True
+    if checkpoint:
+        checkpoint.save(key, state)
+    return collection, state["count"]
+
+
+def find_snapshots(paths):
+    """Expand directories into the snapshot files they contain."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.endswith((".json", ".ndjson", ".ndjson.gz")) and not name.startswith(".")
+            )
+        else:
+            files.append(path)
+    return files
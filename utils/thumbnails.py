@@ -0,0 +1,157 @@
+import importlib.util
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.cache import get_cache
+from utils.logs import get_logger
+from utils.services import get_service, set_service
+
+# Pillow is optional; without it only originals are served. It is imported by
+# the first thumbnail job rather than at startup.
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+
+log = get_logger("utils.thumbnails")
+
+DEFAULT_WIDTHS = (160, 320, 640, 1024)
+DEFAULT_STAT_TTL = 5
+VARIANT_FORMATS = {"jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+                   "webp": ("WEBP", {"quality": 80, "method": 4})}
+VARIANT_DIR = "variants"
+
+
+class ThumbnailPipeline:
+    """Generates resized JPEG and WebP variants of uploaded images on a worker pool.
+
+    Variants live in uploads/<folder>/variants/<stem>-<width>.<fmt> and are
+    picked by the image routes through ?w=. Uploads only enqueue the work.
+    """
+
+    def __init__(self, upload_root, widths=DEFAULT_WIDTHS, workers=2, enabled=True, stat_ttl=DEFAULT_STAT_TTL):
+        self.upload_root = upload_root
+        self.widths = tuple(sorted(widths))
+        self.workers = workers
+        self.enabled = enabled and HAS_PILLOW
+        self.stat_ttl = stat_ttl
+        # Shared with the media server's file metadata, under tuple keys
+        self.stat_cache = get_cache("media_stat")
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def submit(self, folder, filename):
+        """Queue variant generation for a stored image; returns immediately."""
+        if self.enabled:
+            future = self._pool().submit(self.generate, folder, filename)
+            future.add_done_callback(lambda done: self._report(done, folder, filename))
+            return future
+        return None
+
+    @staticmethod
+    def _report(future, folder, filename):
+        # Nobody waits on the future, so a failed job would otherwise vanish silently
+        error = future.exception()
+        if error is not None:
+            log.error("Error generating thumbnails", exc_info=error,
+                      extra={"image": f"{folder}/{filename}", "error": str(error)})
+
+    def variant_path(self, folder, filename, width, fmt):
+        stem = filename.rsplit(".", 1)[0]
+        return os.path.join(self.upload_root, folder, VARIANT_DIR, f"{stem}-{width}.{fmt}")
+
+    def generate(self, folder, filename):
+        """Write every variant narrower than the original. Returns the widths produced."""
+        from PIL import Image
+
+        source = os.path.join(self.upload_root, folder, filename)
+        os.makedirs(os.path.join(self.upload_root, folder, VARIANT_DIR), exist_ok=True)
+        produced = []
+        with Image.open(source) as original:
+            original = original.convert("RGB")
+            for width in self.widths:
+                if width >= original.width:
+                    break
+                height = round(original.height * width / original.width)
+                resized = original.resize((width, height), Image.LANCZOS)
+                for fmt, (pil_format, options) in VARIANT_FORMATS.items():
+                    self._write(resized, self.variant_path(folder, filename, width, fmt), pil_format, options)
+                produced.append(width)
+        return produced
+
+    @staticmethod
+    def _write(image, path, pil_format, options):
+        # Write next to the target and rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                image.save(out, pil_format, **options)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def pick_variant(self, folder, filename, width, webp=False):
+        """Return the path of the smallest existing variant at least `width` wide, or None.
+
+        None means "serve the original": either it is already narrower than
+        the requested width or its variants are still being generated. The
+        answer, found or not, is cached for stat_ttl seconds.
+        """
+        if not self.enabled:
+            return None
+        key = ("variant", folder, filename, width, webp)
+        path = self.stat_cache.get(key)
+        if path is None:
+            path = self._find_variant(folder, filename, width, webp)
+            self.stat_cache.set(key, path or False, ttl=self.stat_ttl)
+        return path or None
+
+    def _find_variant(self, folder, filename, width, webp):
+        formats = ("webp", "jpg") if webp else ("jpg",)
+        for candidate in (w for w in self.widths if w >= width):
+            for fmt in formats:
+                path = self.variant_path(folder, filename, candidate, fmt)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def remove_variants(self, folder, filename):
+        for width in self.widths:
+            for fmt in VARIANT_FORMATS:
+                path = self.variant_path(folder, filename, width, fmt)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def srcset(self, image_url):
+        """Map of "<width>w" -> URL for every variant width, for responsive <img> markup."""
+        if not self.enabled or not image_url:
+            return {}
+        return {f"{width}w": f"{image_url}?w={width}" for width in self.widths}
+
+
+# Outside an app (scripts, benchmarks) no variants are generated or linked
+_disabled = ThumbnailPipeline(upload_root="uploads", enabled=False)
+
+
+def configure_thumbnails(app, upload_root):
+    config = app.config
+    pipeline = ThumbnailPipeline(
+        upload_root,
+        widths=config.get("THUMBNAIL_WIDTHS", DEFAULT_WIDTHS),
+        workers=config.get("THUMBNAIL_WORKERS", 2),
+        enabled=config.get("THUMBNAILS_ENABLED", True),
+        stat_ttl=config.get("MEDIA_STAT_TTL", DEFAULT_STAT_TTL),
+    )
+    return set_service(app, "thumbnails", pipeline)
+
+
+def get_thumbnails():
+    return get_service("thumbnails", _disabled)
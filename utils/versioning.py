@@ -0,0 +1,117 @@
+import datetime
+import hashlib
+from functools import wraps
+from flask import g, has_request_context, request, make_response, jsonify
+from pymongo.errors import PyMongoError
+from utils.logs import get_logger
+
+log = get_logger("utils.versioning")
+
+
+class CollectionVersions:
+    """Per-collection change counters shared by every worker through MongoDB.
+
+    Within a request the counters are read once and remembered on flask.g, so
+    the conditional decorator and the model caches keyed on them agree and
+    share a single query; bump() forgets the bumped collection.
+    """
+
+    def __init__(self, db):
+        self.collection = db["collection_versions"]
+
+    def get(self, name):
+        """Return (version, updated_at) for a collection; (0, None) if never written."""
+        return self.get_states([name])[name]
+
+    def get_many(self, names):
+        """Return {name: version} for several collections in one query."""
+        return {name: version for name, (version, _) in self.get_states(names).items()}
+
+    def get_states(self, names):
+        """Return {name: (version, updated_at)}, querying only collections not read yet in this request."""
+        known = _request_states()
+        missing = [name for name in names if name not in known]
+        if missing:
+            fetched = {name: (0, None) for name in missing}
+            for doc in self.collection.find({"_id": {"$in": missing}}):
+                fetched[doc["_id"]] = (doc["version"], doc.get("updated_at"))
+            known.update(fetched)
+        return {name: known[name] for name in names}
+
+    def bump(self, name):
+        self.collection.update_one(
+            {"_id": name},
+            {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+            upsert=True,
+        )
+        _request_states().pop(name, None)
+
+
+def _request_states():
+    """The counters read so far in this request; a throwaway dict outside of one."""
+    if not has_request_context():
+        return {}
+    if "collection_states" not in g:
+        g.collection_states = {}
+    return g.collection_states
+
+
+def compute_etag(states, path):
+    raw = "|".join(f"{name}:{version}" for name, (version, _) in states) + "|" + path
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _last_modified(states):
+    stamps = [updated_at for _, (_, updated_at) in states if updated_at]
+    if not stamps:
+        return None
+    latest = max(stamps)
+    if latest.tzinfo is None:
+        latest = latest.replace(tzinfo=datetime.timezone.utc)
+    # HTTP dates only carry whole seconds
+    return latest.replace(microsecond=0)
+
+
+def validators(states, path):
+    """Return (etag, last_modified) for [(collection, (version, updated_at))] and a request path."""
+    return compute_etag(states, path), _last_modified(states)
+
+
+def is_not_modified(request, etag, last_modified):
+    """Whether the request's If-None-Match / If-Modified-Since still match."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    since = request.if_modified_since
+    return bool(since and last_modified and last_modified <= since)
+
+
+def conditional(versions, *collections):
+    """Add a strong ETag and Last-Modified to a GET view and answer 304 when the client is current.
+
+    The validators are derived from the version counters of the given
+    collections, read in one query, so a 304 is returned without running
+    the view at all. If MongoDB cannot be reached the answer is a JSON 503.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                states = list(versions.get_states(collections).items())
+            except PyMongoError as e:
+                log.error("Error reading collection versions", extra={"error": str(e)})
+                return jsonify({"error": "Catalog temporarily unavailable"}), 503
+            etag, last_modified = validators(states, request.full_path)
+
+            if is_not_modified(request, etag, last_modified):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator